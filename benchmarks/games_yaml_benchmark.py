@@ -0,0 +1,47 @@
+# Run from the repository root: python -m benchmarks.games_yaml_benchmark
+import os
+import tempfile
+import timeit
+
+from src.games_yaml import read_games_yaml
+
+ENTRIES = 50_000
+ITERATIONS = 10
+
+
+def read_games_split(path: str):
+    # The split-based approach games.yml used to be read with
+    with open(path, encoding="utf-8") as file:
+        valid_yaml_lines = [line for line in file.read().splitlines() if ": " in line]
+
+    return [
+        tuple(part.strip() for part in line.split(": ")) for line in valid_yaml_lines
+    ]
+
+
+def write_synthetic_games_file(path: str):
+    with open(path, "w", encoding="utf-8") as file:
+        for index in range(ENTRIES):
+            file.write(
+                f"BLUS{index:05}: /mnt/nas/ps3/Game {index:05} [BLUS{index:05}]/\n"
+            )
+
+
+def benchmark(label: str, function, path: str):
+    seconds = timeit.timeit(lambda: function(path), number=ITERATIONS)
+    print(f"{label:<10} {seconds / ITERATIONS * 1e3:8.2f} ms per read")
+    return seconds
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "games.yml")
+        write_synthetic_games_file(path)
+
+        assert list(read_games_yaml(path)) == read_games_split(path)
+
+        split = benchmark("split", read_games_split, path)
+        streaming = benchmark(
+            "streaming", lambda path: list(read_games_yaml(path)), path
+        )
+        print(f"speedup    {split / streaming:8.2f}x")
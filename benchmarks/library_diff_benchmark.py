@@ -0,0 +1,59 @@
+# Run from the repository root: python -m benchmarks.library_diff_benchmark
+import timeit
+
+from galaxy.api.consts import LocalGameState
+
+from src.library_snapshot import GameRecord, LibraryDiff
+
+GAMES = 20_000
+CHURN = 0.01
+ITERATIONS = 50
+
+
+class CountingPlugin:
+    def __init__(self):
+        self.calls = 0
+
+    def _count(self, _argument):
+        self.calls += 1
+
+    add_game = remove_game = update_game = update_local_game_status = _count
+
+
+def create_snapshots():
+    older = {
+        f"BLUS{index:05}": GameRecord(f"Game {index}", LocalGameState.Installed)
+        for index in range(GAMES)
+    }
+    newer = dict(older)
+
+    # Spread the churn evenly over removals, additions, renames and state changes
+    changes = int(GAMES * CHURN) // 4
+    for index in range(changes):
+        del newer[f"BLUS{index:05}"]
+        newer[f"NPEB{index:05}"] = GameRecord(f"New {index}", LocalGameState.Installed)
+
+        renamed = f"BLUS{changes + index:05}"
+        newer[renamed] = newer[renamed]._replace(title=f"Renamed {index}")
+
+        started = f"BLUS{2 * changes + index:05}"
+        newer[started] = newer[started]._replace(
+            local_state=LocalGameState.Installed | LocalGameState.Running
+        )
+
+    return older, newer
+
+
+if __name__ == "__main__":
+    older, newer = create_snapshots()
+
+    seconds = timeit.timeit(
+        lambda: LibraryDiff.compute(older, newer), number=ITERATIONS
+    )
+
+    plugin = CountingPlugin()
+    LibraryDiff.compute(older, newer).apply(plugin)
+
+    print(f"games          {GAMES:8}")
+    print(f"diff           {seconds / ITERATIONS * 1e3:8.2f} ms")
+    print(f"notifications  {plugin.calls:8} (full re-send: {2 * len(newer)})")
@@ -0,0 +1,54 @@
+# Run from the repository root: python -m benchmarks.memory_benchmark
+import tracemalloc
+
+from src.rpcs3 import RPCS3Game
+from src.sfo import CompactSfo, Sfo, decode_sfo_bytes
+
+SFO_FILE = "test/wipeout.sfo"
+GAMES = 20_000
+
+
+class LegacyGame:
+    # Game record as it was before __slots__ and CompactSfo
+    def __init__(self, id: str, directory: str, sfo: Sfo):
+        self.id = id
+        self.directory = directory
+        self.metadata_index = None
+        self.updates = []
+        self.additional_content = []
+        self._cached_sfo = sfo
+
+
+def legacy_game(index: int, sfo_bytes: bytes):
+    sfo = decode_sfo_bytes(sfo_bytes)
+    # Without interning, every decoded key is a separate string
+    sfo._mapping = {"".join(key): value for key, value in sfo._mapping.items()}
+
+    return LegacyGame(f"BLUS{index:05}", f"/mnt/nas/ps3/Game {index:05}/", sfo)
+
+
+def compact_game(index: int, sfo_bytes: bytes):
+    game = RPCS3Game(f"BLUS{index:05}", f"/mnt/nas/ps3/Game {index:05}/")
+    game._cached_sfo = CompactSfo(decode_sfo_bytes(sfo_bytes)._mapping)
+
+    return game
+
+
+def measure(label: str, create_game, sfo_bytes: bytes) -> float:
+    tracemalloc.start()
+    games = [create_game(index, sfo_bytes) for index in range(GAMES)]
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_game = retained / len(games)
+    print(f"{label:<8} {per_game:8.0f} bytes per game")
+    return per_game
+
+
+if __name__ == "__main__":
+    with open(SFO_FILE, "rb") as file:
+        sfo_bytes = file.read()
+
+    before = measure("before", legacy_game, sfo_bytes)
+    after = measure("after", compact_game, sfo_bytes)
+    print(f"saving   {1 - after / before:8.1%}")
@@ -0,0 +1,38 @@
+# Run from the repository root: python -m benchmarks.proc_scan_benchmark
+import timeit
+
+from galaxy.proc_tools import ProcessScanner, process_iter
+
+ITERATIONS = 50
+
+
+def is_rpcs3(binary_path: str) -> bool:
+    return "rpcs3" in binary_path.lower()
+
+
+def scan_with_process_iter():
+    return [
+        process_info
+        for process_info in process_iter()
+        if process_info
+        and process_info.binary_path
+        and is_rpcs3(process_info.binary_path)
+    ]
+
+
+def benchmark(label: str, function):
+    seconds = timeit.timeit(function, number=ITERATIONS)
+    print(f"{label:<20} {seconds / ITERATIONS * 1e3:8.3f} ms per scan")
+    return seconds
+
+
+if __name__ == "__main__":
+    baseline = benchmark("process_iter", scan_with_process_iter)
+    cold = benchmark("scanner (cold)", lambda: ProcessScanner(is_rpcs3).scan())
+
+    scanner = ProcessScanner(is_rpcs3)
+    scanner.scan()
+    warm = benchmark("scanner (warm)", scanner.scan)
+
+    print(f"speedup (cold)       {baseline / cold:8.2f}x")
+    print(f"speedup (warm)       {baseline / warm:8.2f}x")
@@ -0,0 +1,21 @@
+# Run from the repository root: python -m benchmarks.sfo_benchmark
+import timeit
+
+from src.sfo import decode_sfo_file
+
+SFO_FILE = "test/wipeout.sfo"
+ITERATIONS = 5000
+
+
+def benchmark(label: str, streaming: bool):
+    seconds = timeit.timeit(
+        lambda: decode_sfo_file(SFO_FILE, streaming=streaming), number=ITERATIONS
+    )
+    print(f"{label:<10} {seconds / ITERATIONS * 1e6:8.2f} µs per decode")
+    return seconds
+
+
+if __name__ == "__main__":
+    streaming = benchmark("streaming", streaming=True)
+    buffered = benchmark("buffered", streaming=False)
+    print(f"speedup    {streaming / buffered:8.2f}x")
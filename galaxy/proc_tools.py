@@ -1,15 +1,20 @@
+import os
 import sys
 from dataclasses import dataclass
-from typing import Iterable, NewType, Optional, List, cast
+from typing import Callable, Dict, Iterable, NewType, Optional, List, Tuple, cast
 
 
 ProcessId = NewType("ProcessId", int)
+# Start time and name of a process, which change when its PID is reused or it
+# executes another binary
+ProcessStamp = Tuple[int, str]
 
 
 @dataclass
 class ProcessInfo:
     pid: ProcessId
     binary_path: Optional[str]
+    command_line: Optional[List[str]] = None
 
 
 if sys.platform == "win32":
@@ -85,3 +90,214 @@ else:
 def process_iter() -> Iterable[Optional[ProcessInfo]]:
     for pid in pids():
         yield get_process_info(pid)
+
+
+if sys.platform.startswith("linux"):
+    def _scan_pids() -> Iterable[ProcessId]:
+        return [ProcessId(int(name)) for name in os.listdir("/proc") if name.isdigit()]
+
+
+    def _read_binary_path(pid: ProcessId) -> Optional[str]:
+        try:
+            return os.readlink("/proc/%d/exe" % pid)
+        except OSError:
+            return None
+
+
+    def _read_command_line(pid: ProcessId) -> Optional[List[str]]:
+        try:
+            with open("/proc/%d/cmdline" % pid, "rb") as cmdline:
+                arguments = cmdline.read().split(b"\0")
+        except OSError:
+            return None
+
+        return [os.fsdecode(argument) for argument in arguments if argument]
+
+
+    def _read_process_stamp(pid: ProcessId) -> Optional[ProcessStamp]:
+        try:
+            with open("/proc/%d/stat" % pid, "rb") as stat:
+                content = stat.read()
+        except OSError:
+            return None
+
+        # The name is parenthesized and may contain spaces and parentheses itself
+        name_start = content.find(b"(")
+        name_end = content.rfind(b")")
+        fields = content[name_end + 2:].split()
+        try:
+            # Field 22 of stat(5), the 20th after the name
+            start_time = int(fields[19])
+        except (IndexError, ValueError):
+            return None
+
+        return start_time, os.fsdecode(content[name_start + 1:name_end])
+elif sys.platform == "win32":
+    from ctypes import POINTER, Structure, WinDLL, c_int, c_long, c_void_p, c_wchar_p, create_string_buffer, get_last_error, wstring_at
+    from ctypes.wintypes import BOOL, FILETIME, HANDLE, HLOCAL, LPCWSTR, ULONG, USHORT
+
+    _PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    _ERROR_ACCESS_DENIED = 5
+    # Readable with limited query access since Windows 8.1
+    _PROCESS_COMMAND_LINE_INFORMATION = 60
+
+    _kernel32 = WinDLL("kernel32", use_last_error=True)
+    _kernel32.OpenProcess.argtypes = [DWORD, BOOL, DWORD]
+    _kernel32.OpenProcess.restype = HANDLE
+    _kernel32.CloseHandle.argtypes = [HANDLE]
+    _kernel32.GetProcessTimes.argtypes = [HANDLE] + [POINTER(FILETIME)] * 4
+    _kernel32.GetProcessTimes.restype = BOOL
+    _kernel32.LocalFree.argtypes = [HLOCAL]
+    _kernel32.LocalFree.restype = HLOCAL
+
+    _ntdll = WinDLL("ntdll")
+    _ntdll.NtQueryInformationProcess.argtypes = [HANDLE, c_int, c_void_p, ULONG, POINTER(ULONG)]
+    _ntdll.NtQueryInformationProcess.restype = c_long
+
+    _shell32 = WinDLL("shell32")
+    _shell32.CommandLineToArgvW.argtypes = [LPCWSTR, POINTER(c_int)]
+    _shell32.CommandLineToArgvW.restype = POINTER(c_wchar_p)
+
+
+    class _UnicodeString(Structure):
+        _fields_ = [("Length", USHORT), ("MaximumLength", USHORT), ("Buffer", c_void_p)]
+
+
+    def _scan_pids() -> Iterable[ProcessId]:
+        return pids()
+
+
+    def _read_binary_path(pid: ProcessId) -> Optional[str]:
+        process_info = get_process_info(pid)
+        return process_info.binary_path if process_info else None
+
+
+    def _split_command_line(command_line: str) -> Optional[List[str]]:
+        if not command_line:
+            # CommandLineToArgvW would return the path of this process instead
+            return []
+
+        argc = c_int()
+        argv = _shell32.CommandLineToArgvW(command_line, byref(argc))
+        if not argv:
+            return None
+
+        try:
+            return [argv[index] for index in range(argc.value)]
+        finally:
+            _kernel32.LocalFree(argv)
+
+
+    def _read_command_line(pid: ProcessId) -> Optional[List[str]]:
+        h_process = _kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not h_process:
+            return None
+
+        try:
+            size = ULONG()
+            _ntdll.NtQueryInformationProcess(h_process, _PROCESS_COMMAND_LINE_INFORMATION, None, 0, byref(size))
+            if not size.value:
+                return None
+
+            buffer = create_string_buffer(size.value)
+            if _ntdll.NtQueryInformationProcess(
+                h_process, _PROCESS_COMMAND_LINE_INFORMATION, buffer, size, byref(size)
+            ) != 0:
+                return None
+
+            command_line = _UnicodeString.from_buffer(buffer)
+            if not command_line.Buffer:
+                return []
+
+            return _split_command_line(wstring_at(command_line.Buffer, command_line.Length // 2))
+        finally:
+            _kernel32.CloseHandle(h_process)
+
+
+    def _read_process_stamp(pid: ProcessId) -> Optional[ProcessStamp]:
+        h_process = _kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not h_process:
+            # Protected processes are running but can't be inspected, so they
+            # are examined once; any other failure means the PID is gone
+            return (0, "") if get_last_error() == _ERROR_ACCESS_DENIED else None
+
+        try:
+            creation_time, exit_time, kernel_time, user_time = FILETIME(), FILETIME(), FILETIME(), FILETIME()
+            if not _kernel32.GetProcessTimes(
+                h_process, byref(creation_time), byref(exit_time), byref(kernel_time), byref(user_time)
+            ):
+                return None
+
+            # Windows processes can't execute another binary, so the start
+            # time alone tells reused PIDs apart
+            return (creation_time.dwHighDateTime << 32) | creation_time.dwLowDateTime, ""
+        finally:
+            _kernel32.CloseHandle(h_process)
+else:
+    def _scan_pids() -> Iterable[ProcessId]:
+        return pids()
+
+
+    def _read_binary_path(pid: ProcessId) -> Optional[str]:
+        process_info = get_process_info(pid)
+        return process_info.binary_path if process_info else None
+
+
+    def _read_command_line(pid: ProcessId) -> Optional[List[str]]:
+        try:
+            return psutil.Process(pid=pid).cmdline()
+        except psutil.Error:
+            return None
+
+
+    def _read_process_stamp(pid: ProcessId) -> Optional[ProcessStamp]:
+        try:
+            process = psutil.Process(pid=pid)
+            return int(process.create_time() * 1000000), process.name()
+        except psutil.NoSuchProcess:
+            return None
+        except psutil.AccessDenied:
+            return (0, "")
+
+
+class ProcessScanner:
+    """Finds processes whose binary path satisfies `binary_filter`.
+
+    A process is examined when its PID first shows up and again whenever its
+    start time or name changes, which happens when the PID is reused or the
+    process executes another binary. On Linux both are read from
+    /proc/<pid>/stat, the binary path and command line directly from /proc,
+    and the command line only for matches. On Windows the start time is the
+    process creation time, and the command line is read through
+    NtQueryInformationProcess, which needs Windows 8.1 or later.
+    """
+
+    def __init__(self, binary_filter: Callable[[str], bool]):
+        self._binary_filter = binary_filter
+        # Known PIDs with their stamp, mapped to None if the process didn't match
+        self._known: Dict[ProcessId, Tuple[ProcessStamp, Optional[ProcessInfo]]] = {}
+
+    def _examine(self, pid: ProcessId) -> Optional[ProcessInfo]:
+        binary_path = _read_binary_path(pid)
+        if binary_path is None or not self._binary_filter(binary_path):
+            return None
+
+        return ProcessInfo(pid=pid, binary_path=binary_path, command_line=_read_command_line(pid))
+
+    def scan(self) -> List[ProcessInfo]:
+        known = {}
+
+        for pid in _scan_pids():
+            stamp = _read_process_stamp(pid)
+            if stamp is None:
+                # The process has exited
+                continue
+
+            entry = self._known.get(pid)
+            if entry is None or entry[0] != stamp:
+                entry = (stamp, self._examine(pid))
+            known[pid] = entry
+
+        self._known = known
+
+        return [process_info for _stamp, process_info in known.values() if process_info is not None]
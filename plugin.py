@@ -1,21 +1,66 @@
+import asyncio
+import logging
 import sys
-from typing import Any, Dict, List
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
 from urllib.parse import urlparse, parse_qs
 
 from galaxy.api.errors import AuthenticationRequired
 from galaxy.api.plugin import Plugin, create_and_run_plugin
 from galaxy.api.consts import LocalGameState, Platform
 from galaxy.api.types import (
+    Achievement,
     Authentication,
-    Game,
-    LicenseInfo,
-    LicenseType,
+    GameTime,
     LocalGame,
     NextStep,
 )
-
-from src.rpcs3 import RPCS3, RPCS3Game
+from galaxy.proc_tools import ProcessInfo, ProcessScanner
+
+from src.installations import RPCS3Installations
+from src.launch_prefetch import LaunchPrefetcher
+from src.library_snapshot import GameRecord, LibrarySnapshot, to_gog_game
+from src.library_watcher import PathWatcher, create_path_watcher
+from src.log_monitor import EmulationLogMonitor, EmulationSession
+from src.metadata_index import SfoMetadataIndex
+from src.process_tracker import (
+    ProcessTracker,
+    eboot_game_ids,
+    games_in_processes,
+    is_rpcs3_binary,
+)
+from src.rpcs3 import (
+    RPCS3,
+    GameNotFoundError,
+    LibraryScan,
+    RPCS3Game,
+    StorageUnreachableError,
+)
 from src.setup_server import serve_file_explorer
+from src.sfo_cache import shared_sfo_cache
+from src.trophy_catalog import TrophyCatalog
+
+METADATA_INDEX_FILE = Path(__file__).parent / "metadata_index.sqlite3"
+TROPHY_CATALOG_FILE = Path(__file__).parent / "trophy_catalog.sqlite3"
+
+# Seconds to wait after a library change, so that bursts of writes settle
+LIBRARY_CHANGE_DELAY = 0.5
+
+LIBRARY_SNAPSHOT_CACHE_KEY = "library_snapshot"
+
+# Seconds for which the scan prefetched after startup answers the first imports
+PREFETCHED_SCAN_MAX_AGE = 60
+
+# Seconds between scans for RPCS3 processes not launched by the plugin
+PROCESS_SCAN_INTERVAL = 5
+
+# Bytes of a game's files pulled into the page cache while RPCS3 starts, 0 to
+# launch without prefetching
+LAUNCH_PREFETCH_BUDGET = LaunchPrefetcher.DEFAULT_BYTE_BUDGET
+# Globs relative to the EBOOT.BIN directory prefetched after it
+LAUNCH_PREFETCH_HOT_FILES = LaunchPrefetcher.DEFAULT_HOT_FILES
+
+logger = logging.getLogger(__name__)
 
 
 class RPCS3IntegrationPlugin(Plugin):
@@ -29,21 +74,264 @@ class RPCS3IntegrationPlugin(Plugin):
         )
 
         self.rpcs3 = None
+        self.library_watcher: Optional[PathWatcher] = None
+        self.metadata_index = SfoMetadataIndex(str(METADATA_INDEX_FILE))
+        self.trophy_catalog = TrophyCatalog(str(TROPHY_CATALOG_FILE))
+        self.process_tracker = ProcessTracker(self._on_running_changed)
+        # Follow the RPCS3.log of each installation once RPCS3 is configured
+        self.log_monitors: List[EmulationLogMonitor] = []
+
+        # Games as last reported to Galaxy
+        self._reported_snapshot: Optional[LibrarySnapshot] = None
+        # Snapshot from the persistent cache, used to answer the first import
+        self._startup_snapshot: Optional[LibrarySnapshot] = None
+
+        # Whether each game's EBOOT.BIN was found during the last scan
+        self._installed_games: Dict[str, bool] = {}
+        # Game IDs by normalized EBOOT.BIN path, as of the last scan
+        self._eboot_game_ids: Dict[str, str] = {}
+
+        # Size computations of the running local size import, by game ID
+        self._size_tasks: Dict[str, asyncio.Future] = {}
+
+        self._handshake_completed = False
+        self._prefetch_started = False
+        # Imports that have yet to consume the prefetched scan
+        self._prefetch_consumers: Set[str] = set()
+
+    @staticmethod
+    def _installation_configurations(
+        configuration: Dict[str, Any],
+    ) -> List[Dict[str, str]]:
+        # Credentials stored before several installations were supported hold
+        # a single installation
+        if "installations" not in configuration:
+            return [configuration]
+
+        return configuration["installations"]
+
+    def _create_installation(self, configuration: Dict[str, str]) -> RPCS3:
+        return RPCS3(
+            configuration["executable"],
+            configuration["configurationDirectory"],
+            self.metadata_index,
+            trophy_catalog=self.trophy_catalog,
+            launch_prefetcher=(
+                LaunchPrefetcher(LAUNCH_PREFETCH_BUDGET, LAUNCH_PREFETCH_HOT_FILES)
+                if LAUNCH_PREFETCH_BUDGET > 0
+                else None
+            ),
+        )
 
-    def _initialize_rpcs3(self, configuration: Dict[str, str]):
-        self.rpcs3 = RPCS3(
-            configuration["executable"], configuration["configurationDirectory"]
+    def _initialize_rpcs3(self, configuration: Dict[str, Any]):
+        installations = [
+            self._create_installation(installation_configuration)
+            for installation_configuration in self._installation_configurations(
+                configuration
+            )
+        ]
+        self.rpcs3 = RPCS3Installations(installations)
+
+        self.log_monitors = [
+            EmulationLogMonitor(
+                installation.log_file,
+                self._on_emulation_changed,
+                self._on_session_finished,
+            )
+            for installation in installations
+        ]
+
+        self.library_watcher = create_path_watcher(self.rpcs3.watched_paths)
+        self.create_task(self._watch_library(self.library_watcher), "Watch library")
+        self.create_task(self._watch_processes(), "Watch RPCS3 processes")
+        for log_monitor in self.log_monitors:
+            self.create_task(log_monitor.run(), f"Watch {log_monitor.tailer.path}")
+        self._start_prefetch()
+
+    def _start_prefetch(self):
+        """Scans the library in the background once both the handshake and the
+        authentication are done, so that the first imports needn't wait."""
+        if self._prefetch_started or not self._handshake_completed:
+            return
+        if self.rpcs3 is None:
+            return
+
+        self._prefetch_started = True
+        self._prefetch_consumers = {"owned", "local"}
+        self.create_task(self.rpcs3.scan_games(), "Prefetch library")
+
+    def _scan_max_age(self, consumer: str) -> Optional[float]:
+        if consumer in self._prefetch_consumers:
+            self._prefetch_consumers.discard(consumer)
+            return PREFETCHED_SCAN_MAX_AGE
+
+        return None
+
+    async def _watch_library(self, watcher: PathWatcher):
+        try:
+            while True:
+                await watcher.wait_for_change()
+                await asyncio.sleep(LIBRARY_CHANGE_DELAY)
+
+                try:
+                    await self._refresh_library()
+                except Exception:
+                    logger.exception("Failed to refresh library")
+        finally:
+            watcher.close()
+
+    async def _watch_processes(self):
+        """Detects games running in RPCS3 processes the plugin didn't launch,
+        by the EBOOT.BIN they were started with."""
+        scanner = ProcessScanner(is_rpcs3_binary)
+        loop = asyncio.get_running_loop()
+
+        while True:
+            try:
+                processes = await loop.run_in_executor(None, scanner.scan)
+            except Exception:
+                logger.exception("Failed to scan processes")
+            else:
+                self._on_processes_scanned(processes)
+
+            await asyncio.sleep(PROCESS_SCAN_INTERVAL)
+
+    def _on_processes_scanned(self, processes: List[ProcessInfo]):
+        if not processes:
+            # RPCS3 has exited, possibly without logging the stop
+            for log_monitor in self.log_monitors:
+                log_monitor.abandon()
+
+        self.process_tracker.set_external(
+            "processes", games_in_processes(processes, self._eboot_game_ids)
+        )
+        self._publish_emulated_titles()
+
+    def _publish_emulated_titles(self):
+        self.process_tracker.set_external(
+            "log",
+            [
+                log_monitor.running_title_id
+                for log_monitor in self.log_monitors
+                if log_monitor.running_title_id is not None
+            ],
         )
 
+    async def _refresh_library(self):
+        """Notifies Galaxy about the games that changed since the last import."""
+        if self._reported_snapshot is None:
+            # Galaxy hasn't imported any games yet
+            return
+
+        scan = await self._scan_library()
+        snapshot = self._snapshot_of(scan)
+
+        self._reported_snapshot.diff(snapshot).apply(self)
+        self._store_snapshot(snapshot)
+
+    def _snapshot_of(self, scan: LibraryScan) -> LibrarySnapshot:
+        """Takes a snapshot of the scanned games.
+
+        Games whose storage is unreachable keep their last reported title and
+        are reported as not installed, so that a dead network share doesn't
+        remove them from Galaxy.
+        """
+        snapshot = LibrarySnapshot.from_games(
+            scan.games, scan.stamps, self._local_game_state
+        )
+        if self._reported_snapshot is None:
+            return snapshot
+
+        for game_id, error in scan.failures.items():
+            record = self._reported_snapshot.games.get(game_id)
+            if record is not None and isinstance(error, StorageUnreachableError):
+                snapshot.games[game_id] = GameRecord(record.title, LocalGameState.None_)
+                # Rescan once the storage is back, even if nothing else changed
+                snapshot.stamps = None
+
+        return snapshot
+
+    def _store_snapshot(self, snapshot: LibrarySnapshot):
+        self._reported_snapshot = snapshot
+
+        serialized = snapshot.serialize()
+        if self.persistent_cache.get(LIBRARY_SNAPSHOT_CACHE_KEY) != serialized:
+            self.persistent_cache[LIBRARY_SNAPSHOT_CACHE_KEY] = serialized
+            self.push_cache()
+
+    async def _revalidate_snapshot(self):
+        """Rescans the library unless it is unchanged since the reported
+        snapshot was taken."""
+        # Stats every SFO of dev_hdd0/game, which mustn't block the event loop
+        stamps = await asyncio.get_running_loop().run_in_executor(
+            None, self.rpcs3.read_library_stamps
+        )
+        if stamps == self._reported_snapshot.stamps:
+            return
+
+        await self._refresh_library()
+
+    def _local_game_state(self, game_id: str) -> LocalGameState:
+        if self.process_tracker.is_running(game_id):
+            return LocalGameState.Installed | LocalGameState.Running
+
+        if self._installed_games.get(game_id, True):
+            return LocalGameState.Installed
+
+        return LocalGameState.None_
+
+    def _notify_local_game_state(self, game_id: str):
+        local_state = self._local_game_state(game_id)
+        self.update_local_game_status(LocalGame(game_id, local_state))
+
+        # Keep the snapshot in line so the change isn't reported twice
+        snapshot = self._reported_snapshot
+        if snapshot is not None and game_id in snapshot.games:
+            snapshot.games[game_id] = snapshot.games[game_id]._replace(
+                local_state=local_state
+            )
+
+    def _on_running_changed(self, game_id: str):
+        # Titles booted from RPCS3 needn't be games Galaxy knows about
+        snapshot = self._reported_snapshot
+        if snapshot is not None and game_id in snapshot.games:
+            self._notify_local_game_state(game_id)
+
+    def _on_emulation_changed(self, title_id: str):
+        self._publish_emulated_titles()
+
+    def _on_session_finished(self, session: EmulationSession):
+        logger.info("Played %s for %.0fs", session.title_id, session.seconds)
+        self.create_task(
+            self._update_game_time(session.title_id),
+            f"Update game time of {session.title_id}",
+        )
+
+    async def _update_game_time(self, game_id: str):
+        # RPCS3 saves the playtime around the time it logs the stop
+        await asyncio.sleep(LIBRARY_CHANGE_DELAY)
+
+        playtime = (await self.rpcs3.read_playtime()).get(game_id)
+        if playtime is not None:
+            self.update_game_time(
+                GameTime(game_id, playtime.minutes, playtime.last_played)
+            )
+
     def _parse_configuration_from_next_step(self, next_step_response: Dict[str, Any]):
         callback_url = next_step_response["end_uri"]
 
         parsed_url = urlparse(callback_url)
         query_parameters = parse_qs(parsed_url.query)
 
+        # Each installation is passed as a pair of repeated parameters
         return {
-            "executable": query_parameters["executable"][0],
-            "configurationDirectory": query_parameters["configurationDirectory"][0],
+            "installations": [
+                {"executable": executable, "configurationDirectory": directory}
+                for executable, directory in zip(
+                    query_parameters["executable"],
+                    query_parameters["configurationDirectory"],
+                )
+            ]
         }
 
     # required
@@ -77,40 +365,149 @@ class RPCS3IntegrationPlugin(Plugin):
             RPCS3IntegrationPlugin.USER_ID, RPCS3IntegrationPlugin.USER_NAME
         )
 
+    async def _scan_library(self, max_age: Optional[float] = None) -> LibraryScan:
+        scan = await self.rpcs3.scan_games(max_age)
+        self._installed_games = scan.installed
+        self._eboot_game_ids = eboot_game_ids(
+            {game.id: game.find_eboot_file() for game in scan.games}
+        )
+
+        for game_id, error in scan.failures.items():
+            logger.warning("Failed to read metadata of game %s: %r", game_id, error)
+
+        # Rows of files that were indexed before aren't validated against
+        # missing files, so that unplugged games keep their metadata, and are
+        # instead dropped once they no longer belong to any library
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.metadata_index.retain, self.rpcs3.library_sfo_files
+        )
+
+        # Entries of dev_hdd0/game get their SFO after the directory, which
+        # doesn't change the directory itself
+        if self.library_watcher is not None:
+            self.library_watcher.add_paths(scan.pending_files)
+
+        logger.debug(
+            "SFO cache: %d hits, %d misses, %d entries",
+            shared_sfo_cache.hits,
+            shared_sfo_cache.misses,
+            len(shared_sfo_cache),
+        )
+
+        return scan
+
+    def handshake_complete(self):
+        self._startup_snapshot = LibrarySnapshot.deserialize(
+            self.persistent_cache.get(LIBRARY_SNAPSHOT_CACHE_KEY)
+        )
+
+        self._handshake_completed = True
+        self._start_prefetch()
+
     # required
     async def get_owned_games(self):
         if self.rpcs3 is None:
             raise AuthenticationRequired()
 
+        if self._startup_snapshot is not None:
+            # Answer from the cached snapshot and catch up in the background
+            snapshot, self._startup_snapshot = self._startup_snapshot, None
+            self._reported_snapshot = snapshot
+            self._prefetch_consumers.discard("owned")
+            self.create_task(self._revalidate_snapshot(), "Revalidate library")
+        else:
+            scan = await self._scan_library(self._scan_max_age("owned"))
+            snapshot = self._snapshot_of(scan)
+            self._store_snapshot(snapshot)
+
+        return [
+            to_gog_game(game_id, record.title)
+            for game_id, record in snapshot.games.items()
+        ]
+
+    async def get_local_games(self) -> List[LocalGame]:
+        if self.rpcs3 is None:
+            raise AuthenticationRequired()
+
         # Converts from RPCS3Game to Game instance
-        def to_gog_game(game: RPCS3Game):
-            gog_game = Game(
-                game.id, game.title, None, LicenseInfo(LicenseType.SinglePurchase)
-            )
+        def to_local_game(game: RPCS3Game):
+            return LocalGame(game.id, self._local_game_state(game.id))
 
-            return gog_game
+        scan = await self._scan_library(self._scan_max_age("local"))
 
-        rpcs3_games = self.rpcs3.read_games()
+        return [to_local_game(game) for game in scan.games]
 
-        return [to_gog_game(game) for game in rpcs3_games]
+    async def prepare_local_size_context(self, game_ids: List[str]):
+        if self.rpcs3 is None:
+            raise AuthenticationRequired()
 
-    async def get_local_games(self) -> List[LocalGame]:
+        # Sizes are computed concurrently, while the importer asks for them one
+        # game at a time
+        self._cancel_size_tasks()
+        self._size_tasks = {
+            game_id: asyncio.ensure_future(self.rpcs3.get_game_size(game_id))
+            for game_id in game_ids
+        }
+        return self._size_tasks
+
+    async def get_local_size(self, game_id: str, context) -> Optional[int]:
+        try:
+            return await context[game_id]
+        except GameNotFoundError:
+            return None
+
+    def local_size_import_complete(self):
+        # Galaxy may not have asked for every game it prepared
+        self._cancel_size_tasks()
+
+    def _cancel_size_tasks(self):
+        for task in self._size_tasks.values():
+            task.cancel()
+        self._size_tasks = {}
+
+    async def prepare_game_times_context(self, game_ids: List[str]):
         if self.rpcs3 is None:
             raise AuthenticationRequired()
 
-        # Converts from RPCS3Game to Game instance
-        def to_local_game(game: RPCS3Game):
-            return LocalGame(game.id, LocalGameState.Installed)
+        return await self.rpcs3.read_playtime()
 
-        rpcs3_games = self.rpcs3.read_games()
+    async def get_game_time(self, game_id: str, context) -> GameTime:
+        playtime = context.get(game_id)
+        if playtime is None:
+            return GameTime(game_id, None, None)
 
-        return [to_local_game(game) for game in rpcs3_games]
+        return GameTime(game_id, playtime.minutes, playtime.last_played)
+
+    async def prepare_achievements_context(self, game_ids: List[str]):
+        if self.rpcs3 is None:
+            raise AuthenticationRequired()
+
+        return await self.rpcs3.read_unlocked_trophies(game_ids)
+
+    async def get_unlocked_achievements(
+        self, game_id: str, context
+    ) -> List[Achievement]:
+        return [
+            Achievement(trophy.unlock_time, str(trophy.trophy_id), trophy.name)
+            for trophy in context.get(game_id, [])
+        ]
 
     async def launch_game(self, game_id: str):
         if self.rpcs3 is None:
             raise AuthenticationRequired()
 
-        self.rpcs3.launch_game_by_id(game_id)
+        process = await self.rpcs3.launch_game_by_id(game_id)
+
+        self.create_task(
+            self.process_tracker.watch(game_id, process), f"Watch game {game_id}"
+        )
+
+    async def shutdown(self):
+        if self.rpcs3 is not None:
+            self.rpcs3.close()
+
+        self.metadata_index.close()
+        self.trophy_catalog.close()
 
 
 def main():
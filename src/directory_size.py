@@ -0,0 +1,147 @@
+import asyncio
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Iterable, List, NamedTuple, Set, Tuple
+
+# (st_dev, st_ino) of a file
+FileId = Tuple[int, int]
+
+
+class DirectoryTotals(NamedTuple):
+    mtime_ns: int
+    # Allocated bytes of files without an inode number, as on Windows
+    unidentified_bytes: int
+    # Allocated bytes by file, so that hardlinks are counted once per tree.
+    # Kept for all files because links may be added later in other directories.
+    files: Tuple[Tuple[FileId, int], ...]
+    subdirectories: Tuple[str, ...]
+
+
+def _allocated_bytes(stat: os.stat_result) -> int:
+    # st_blocks isn't available on Windows
+    blocks = getattr(stat, "st_blocks", None)
+    if blocks is None:
+        return stat.st_size
+
+    return blocks * 512
+
+
+class DirectorySizeCalculator:
+    """Sums the space allocated by directory trees.
+
+    Directories are listed in parallel, one tree level at a time. The totals
+    of every directory are cached by its mtime, which changes whenever entries
+    are added, removed or renamed, so rescans only list changed directories.
+    Files modified in place without changing their directory aren't noticed
+    until their directory changes.
+
+    The cache holds the totals of at most `max_cached_files` files, evicting
+    the least recently used directories first.
+    """
+
+    DEFAULT_WORKERS = 8
+    DEFAULT_MAX_CACHED_FILES = 500000
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        max_cached_files: int = DEFAULT_MAX_CACHED_FILES,
+    ):
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="rpcs3-size"
+        )
+        self.max_cached_files = max_cached_files
+
+        # Directories are listed from several threads
+        self._lock = Lock()
+        self._cache: "OrderedDict[str, DirectoryTotals]" = OrderedDict()
+        self._cached_files = 0
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    def _directory_totals(self, directory: str) -> DirectoryTotals:
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return DirectoryTotals(0, 0, (), ())
+
+        with self._lock:
+            cached = self._cache.get(directory)
+            if cached is not None and cached.mtime_ns == mtime_ns:
+                self._cache.move_to_end(directory)
+                return cached
+
+        unidentified_bytes = 0
+        files: List[Tuple[FileId, int]] = []
+        subdirectories: List[str] = []
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+
+                        if stat.st_ino:
+                            file_id = (stat.st_dev, stat.st_ino)
+                            files.append((file_id, _allocated_bytes(stat)))
+                        else:
+                            unidentified_bytes += _allocated_bytes(stat)
+        except OSError:
+            return DirectoryTotals(mtime_ns, 0, (), ())
+
+        totals = DirectoryTotals(
+            mtime_ns, unidentified_bytes, tuple(files), tuple(subdirectories)
+        )
+        self._store(directory, totals)
+
+        return totals
+
+    def _store(self, directory: str, totals: DirectoryTotals):
+        with self._lock:
+            previous = self._cache.pop(directory, None)
+            if previous is not None:
+                self._cached_files -= len(previous.files)
+
+            self._cache[directory] = totals
+            self._cached_files += len(totals.files)
+
+            while self._cached_files > self.max_cached_files and self._cache:
+                _directory, evicted = self._cache.popitem(last=False)
+                self._cached_files -= len(evicted.files)
+
+    async def size_of(self, directories: Iterable[str]) -> int:
+        """Returns the bytes allocated by the given trees together, counting
+        each hardlinked file once."""
+        loop = asyncio.get_running_loop()
+
+        total = 0
+        seen_files: Set[FileId] = set()
+        pending = list(dict.fromkeys(directories))
+
+        while pending:
+            level = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        self._executor, self._directory_totals, directory
+                    )
+                    for directory in pending
+                )
+            )
+
+            pending = []
+            for totals in level:
+                total += totals.unidentified_bytes
+
+                for file_id, allocated_bytes in totals.files:
+                    if file_id not in seen_files:
+                        seen_files.add(file_id)
+                        total += allocated_bytes
+
+                pending.extend(totals.subdirectories)
+
+        return total
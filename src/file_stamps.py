@@ -0,0 +1,43 @@
+import os
+import sqlite3
+from threading import Lock
+from typing import Optional, Tuple
+
+# (mtime_ns, size) of a file, which changes whenever the file is rewritten
+FileStamp = Tuple[int, int]
+
+
+def file_stamp(stat: os.stat_result) -> FileStamp:
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def read_file_stamp(path: str) -> Optional[FileStamp]:
+    """Returns None if `path` can't be stat'ed, such as when it doesn't exist."""
+    try:
+        return file_stamp(os.stat(path))
+    except OSError:
+        return None
+
+
+class StampedDatabase:
+    """SQLite database of data read from files, which subclasses validate
+    against the stamps of the files.
+
+    `SCHEMA` is applied when the database is opened.
+    """
+
+    SCHEMA = ""
+
+    def __init__(self, database_path: str):
+        self.database_path = database_path
+
+        # Lookups may happen from worker threads, writes are serialized by the lock
+        self._connection = sqlite3.connect(database_path, check_same_thread=False)
+        self._lock = Lock()
+
+        with self._lock, self._connection:
+            self._connection.executescript(self.SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
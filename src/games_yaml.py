@@ -0,0 +1,161 @@
+import re
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+class MalformedLineError(ValueError):
+    def __init__(self, line_number: int, line: str, reason: str):
+        super().__init__(f"Line {line_number}: {reason} ({line!r})")
+        self.line_number = line_number
+        self.line = line
+        self.reason = reason
+
+
+class GamesYamlParser:
+    """Streaming parser for the flat `key: value` mapping in RPCS3's games.yml.
+
+    Handles comments, plain scalars and YAML single- and double-quoted scalars.
+    Malformed lines are skipped and collected in `errors`.
+    """
+
+    DOUBLE_QUOTED = re.compile(r'"((?:[^"\\]|\\.)*)"')
+    SINGLE_QUOTED = re.compile(r"'((?:[^']|'')*)'")
+    ESCAPE_SEQUENCE = re.compile(
+        r"\\(x[0-9A-Fa-f]{2}|u[0-9A-Fa-f]{4}|U[0-9A-Fa-f]{8}|.)", re.DOTALL
+    )
+    TRAILING_COMMENT = re.compile(r"\s+#.*$")
+
+    ESCAPES = {
+        "0": "\0",
+        "a": "\a",
+        "b": "\b",
+        "t": "\t",
+        "\t": "\t",
+        "n": "\n",
+        "v": "\v",
+        "f": "\f",
+        "r": "\r",
+        "e": "\x1b",
+        " ": " ",
+        '"': '"',
+        "/": "/",
+        "\\": "\\",
+        "N": "\x85",
+        "_": "\xa0",
+        "L": "\u2028",
+        "P": "\u2029",
+    }
+
+    # Lines that carry no entries
+    IGNORED_LINES = frozenset(["---", "...", "{}"])
+
+    def __init__(self):
+        self.errors: List[MalformedLineError] = []
+
+    @staticmethod
+    def _unescape(match: "re.Match") -> str:
+        sequence = match.group(1)
+
+        if len(sequence) > 1:
+            return chr(int(sequence[1:], 16))
+
+        try:
+            return GamesYamlParser.ESCAPES[sequence]
+        except KeyError:
+            raise ValueError(f"invalid escape sequence \\{sequence}")
+
+    def _parse_scalar(self, text: str) -> Tuple[str, str]:
+        """Parses a scalar at the start of `text` and returns it along with the
+        remaining text."""
+        if text.startswith('"'):
+            match = GamesYamlParser.DOUBLE_QUOTED.match(text)
+            if match is None:
+                raise ValueError("unterminated double-quoted scalar")
+
+            value = GamesYamlParser.ESCAPE_SEQUENCE.sub(
+                GamesYamlParser._unescape, match.group(1)
+            )
+            return value, text[match.end() :]
+
+        if text.startswith("'"):
+            match = GamesYamlParser.SINGLE_QUOTED.match(text)
+            if match is None:
+                raise ValueError("unterminated single-quoted scalar")
+
+            return match.group(1).replace("''", "'"), text[match.end() :]
+
+        return GamesYamlParser.TRAILING_COMMENT.sub("", text).strip(), ""
+
+    def _parse_entry(self, line: str) -> Tuple[str, str]:
+        if line.startswith(("'", '"')):
+            key, rest = self._parse_scalar(line)
+            rest = rest.lstrip(" \t")
+            if not rest.startswith(":"):
+                raise ValueError("expected ':' after key")
+            rest = rest[1:]
+        else:
+            key, separator, rest = line.partition(": ")
+            if not separator:
+                if not line.endswith(":"):
+                    raise ValueError("expected 'key: value'")
+                key, rest = line[:-1], ""
+            key = key.rstrip()
+
+        rest = rest.strip()
+        if not rest or rest.startswith("#"):
+            raise ValueError("missing value")
+
+        value, remainder = self._parse_scalar(rest)
+        remainder = remainder.strip()
+        if remainder and not remainder.startswith("#"):
+            raise ValueError("unexpected text after quoted value")
+
+        return key, value
+
+    def parse(self, lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        for line_number, raw_line in enumerate(lines, start=1):
+            line = raw_line.rstrip("\r\n")
+
+            # Fast path for the plain `ID: path` lines RPCS3 writes
+            key, separator, value = line.partition(": ")
+            if (
+                separator
+                and key
+                and key[0] not in "'\"# \t"
+                and value
+                and value[0] not in "'\"#"
+                and "#" not in value
+            ):
+                yield key.rstrip(), value.strip()
+                continue
+
+            stripped = line.strip()
+            if (
+                not stripped
+                or stripped.startswith("#")
+                or stripped in GamesYamlParser.IGNORED_LINES
+            ):
+                continue
+
+            try:
+                if line[0] in " \t":
+                    raise ValueError("nested values are not supported")
+
+                yield self._parse_entry(line)
+            except ValueError as error:
+                self.errors.append(MalformedLineError(line_number, line, str(error)))
+
+
+def read_games_yaml(
+    path: str, errors: Optional[List[MalformedLineError]] = None
+) -> Iterator[Tuple[str, str]]:
+    """Yields the `(game ID, directory)` pairs of a games.yml file.
+
+    Malformed lines are appended to `errors` if given.
+    """
+    parser = GamesYamlParser()
+
+    with open(path, encoding="utf-8") as file:
+        yield from parser.parse(file)
+
+    if errors is not None:
+        errors.extend(parser.errors)
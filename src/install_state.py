@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import re
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+from typing import Dict, Iterable, List, Match, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Spaces and other separators in mount table paths are escaped as octal numbers
+_OCTAL_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+
+def _unescape(match: Match[str]) -> str:
+    return chr(int(match.group(1), 8))
+
+
+def read_mount_points(mounts_file: str = "/proc/self/mounts") -> List[str]:
+    """Returns the mount points listed in the kernel's mount table, which is
+    read without touching any of the mounted file systems.
+
+    Returns an empty list where there is no such table.
+    """
+    try:
+        with open(mounts_file, "rb") as file:
+            lines = file.read().decode("utf-8", errors="replace").splitlines()
+    except OSError:
+        return []
+
+    mount_points = []
+    for line in lines:
+        fields = line.split()
+        if len(fields) >= 2:
+            mount_points.append(_OCTAL_ESCAPE.sub(_unescape, fields[1]))
+
+    return mount_points
+
+
+def storage_root(file_path: str, mount_points: Iterable[str] = ()) -> str:
+    """Returns the mount a path lives on without touching its storage.
+
+    This is the drive or UNC share on Windows, and elsewhere the longest of
+    `mount_points` containing the path. Without a known mount point it falls
+    back to the first two path components, such as `/Volumes/NAS` on macOS.
+    """
+    file_path = path.normpath(file_path)
+    drive, rest = path.splitdrive(file_path)
+    if drive:
+        return drive.lower()
+
+    containing = [
+        mount_point
+        for mount_point in mount_points
+        if file_path == mount_point
+        or file_path.startswith(mount_point.rstrip(path.sep) + path.sep)
+    ]
+    if containing:
+        return max(containing, key=len)
+
+    components = rest.strip(path.sep).split(path.sep)
+    return path.sep + path.sep.join(components[:2])
+
+
+class InstallStateChecker:
+    """Checks whether files exist with concurrent, timeout-bounded stat calls.
+
+    Paths are grouped by mount. One path per mount is checked first, and if
+    that doesn't answer in time the whole mount is treated as unreachable, so
+    a dead network share costs a single timeout. Unreachable paths are
+    reported as None. Results are cached for `cache_seconds`.
+    """
+
+    DEFAULT_TIMEOUT = 2.0
+    DEFAULT_CACHE_SECONDS = 10.0
+    DEFAULT_WORKERS = 16
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache_seconds: float = DEFAULT_CACHE_SECONDS,
+        workers: int = DEFAULT_WORKERS,
+    ):
+        self.timeout = timeout
+        self.cache_seconds = cache_seconds
+
+        # Maps paths to (time of the check, whether the file exists)
+        self._cache: Dict[str, Tuple[float, Optional[bool]]] = {}
+
+        # Stat calls on dead mounts may block their thread for a long time, so
+        # they get a pool of their own
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="rpcs3-stat"
+        )
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    async def _exists(self, file_path: str) -> bool:
+        loop = asyncio.get_running_loop()
+        exists = await asyncio.wait_for(
+            loop.run_in_executor(self._executor, path.isfile, file_path),
+            self.timeout,
+        )
+
+        self._cache[file_path] = (time.monotonic(), exists)
+        return exists
+
+    async def _check_root(
+        self, root: str, paths: List[str], results: Dict[str, Optional[bool]]
+    ):
+        first, rest = paths[0], paths[1:]
+
+        try:
+            results[first] = await self._exists(first)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Storage %s didn't respond, assuming it is unreachable", root
+            )
+
+            checked_at = time.monotonic()
+            for file_path in paths:
+                results[file_path] = None
+                self._cache[file_path] = (checked_at, None)
+            return
+
+        outcomes = await asyncio.gather(
+            *(self._exists(file_path) for file_path in rest), return_exceptions=True
+        )
+        for file_path, outcome in zip(rest, outcomes):
+            results[file_path] = None if isinstance(outcome, Exception) else outcome
+
+    async def check(self, paths: Iterable[str]) -> Dict[str, Optional[bool]]:
+        """Returns whether each of `paths` is an existing file, or None if its
+        storage is unreachable."""
+        results: Dict[str, Optional[bool]] = {}
+        paths_by_root: Dict[str, List[str]] = defaultdict(list)
+
+        mount_points = read_mount_points()
+
+        now = time.monotonic()
+        for file_path in paths:
+            cached = self._cache.get(file_path)
+            if cached is not None and now - cached[0] <= self.cache_seconds:
+                results[file_path] = cached[1]
+            else:
+                paths_by_root[storage_root(file_path, mount_points)].append(file_path)
+
+        await asyncio.gather(
+            *(
+                self._check_root(root, root_paths, results)
+                for root, root_paths in paths_by_root.items()
+            )
+        )
+
+        return results
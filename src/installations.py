@@ -0,0 +1,178 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional
+
+from .playtime import GamePlaytime
+from .rpcs3 import RPCS3, GameNotFoundError, LibraryScan, LibraryStamps, RPCS3Game
+from .trophies import UnlockedTrophy
+
+
+class RPCS3Installations:
+    """Presents several RPCS3 installations, such as stable and nightly builds
+    with separate libraries, as a single library.
+
+    All installations are scanned concurrently. A game found in several of them
+    is taken from the first installation that has it installed, or from the
+    first one that lists it, in configuration order. Calls for a game are routed
+    to that installation with a dictionary lookup.
+    """
+
+    def __init__(self, installations: List[RPCS3]):
+        self.installations = installations
+
+        # Installation owning each game of the last scan, by game ID
+        self._owners: Dict[str, RPCS3] = {}
+
+    def close(self):
+        for installation in self.installations:
+            installation.close()
+
+    @property
+    def watched_paths(self) -> List[str]:
+        """The files and directories whose changes affect the library."""
+        return [
+            watched_path
+            for installation in self.installations
+            for watched_path in (
+                installation.games_file,
+                installation.hdd0_game_directory,
+            )
+        ]
+
+    @property
+    def library_sfo_files(self) -> List[str]:
+        return [
+            sfo_file
+            for installation in self.installations
+            for sfo_file in installation.library_sfo_files
+        ]
+
+    def read_library_stamps(self) -> LibraryStamps:
+        return tuple(
+            stamp
+            for installation in self.installations
+            for stamp in installation.read_library_stamps()
+        )
+
+    async def scan_games(self, max_age: Optional[float] = None) -> LibraryScan:
+        scans = await asyncio.gather(
+            *(installation.scan_games(max_age) for installation in self.installations)
+        )
+
+        # Installed copies come first, each group in configuration order
+        candidates = [
+            (installation, scan, game)
+            for installed in (True, False)
+            for installation, scan in zip(self.installations, scans)
+            for game in scan.games
+            if scan.installed.get(game.id, False) == installed
+        ]
+
+        owners: Dict[str, RPCS3] = {}
+        games: Dict[str, RPCS3Game] = {}
+        installed: Dict[str, bool] = {}
+        for installation, scan, game in candidates:
+            if game.id not in games:
+                owners[game.id] = installation
+                games[game.id] = game
+                installed[game.id] = scan.installed.get(game.id, False)
+
+        failures = {
+            game_id: error
+            for scan in scans
+            for game_id, error in scan.failures.items()
+            if game_id not in games
+        }
+
+        stamps: Optional[LibraryStamps] = None
+        if all(scan.stamps is not None for scan in scans):
+            stamps = tuple(stamp for scan in scans for stamp in scan.stamps)
+
+        pending_files = [
+            pending_file for scan in scans for pending_file in scan.pending_files
+        ]
+
+        self._owners = owners
+        return LibraryScan(
+            list(games.values()), failures, stamps, installed, pending_files
+        )
+
+    async def owner_of(self, game_id: str) -> RPCS3:
+        """Returns the installation a game is taken from, scanning first if the
+        game isn't known yet."""
+        owner = self._owners.get(game_id)
+        if owner is None:
+            await self.scan_games()
+            owner = self._owners.get(game_id)
+
+        if owner is None:
+            raise GameNotFoundError()
+
+        return owner
+
+    async def get_game_size(self, game_id: str) -> int:
+        return await (await self.owner_of(game_id)).get_game_size(game_id)
+
+    async def read_playtime(self) -> Dict[str, GamePlaytime]:
+        """Returns the playtime of each title summed over all installations,
+        with the latest last-played time."""
+        playtimes = await asyncio.gather(
+            *(installation.read_playtime() for installation in self.installations)
+        )
+
+        merged: Dict[str, GamePlaytime] = {}
+        for playtime in playtimes:
+            for title_id, game_playtime in playtime.items():
+                previous = merged.get(title_id)
+                if previous is None:
+                    merged[title_id] = game_playtime
+                    continue
+
+                minutes = [
+                    value
+                    for value in (previous.minutes, game_playtime.minutes)
+                    if value is not None
+                ]
+                last_played = [
+                    value
+                    for value in (previous.last_played, game_playtime.last_played)
+                    if value is not None
+                ]
+                merged[title_id] = GamePlaytime(
+                    sum(minutes) if minutes else None,
+                    max(last_played) if last_played else None,
+                )
+
+        return merged
+
+    async def read_unlocked_trophies(
+        self, game_ids: Iterable[str]
+    ) -> Dict[str, List[UnlockedTrophy]]:
+        """Returns the trophies each game unlocked in its owning installation,
+        scanning first if any of the games isn't known yet."""
+        game_ids = list(game_ids)
+        if any(game_id not in self._owners for game_id in game_ids):
+            await self.scan_games()
+
+        game_ids_by_owner: Dict[RPCS3, List[str]] = {}
+        unlocked: Dict[str, List[UnlockedTrophy]] = {}
+
+        for game_id in game_ids:
+            owner = self._owners.get(game_id)
+            if owner is None:
+                unlocked[game_id] = []
+            else:
+                game_ids_by_owner.setdefault(owner, []).append(game_id)
+
+        results = await asyncio.gather(
+            *(
+                owner.read_unlocked_trophies(owned_game_ids)
+                for owner, owned_game_ids in game_ids_by_owner.items()
+            )
+        )
+        for result in results:
+            unlocked.update(result)
+
+        return unlocked
+
+    async def launch_game_by_id(self, game_id: str) -> asyncio.subprocess.Process:
+        return await (await self.owner_of(game_id)).launch_game_by_id(game_id)
@@ -0,0 +1,109 @@
+import asyncio
+import glob
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+from typing import Iterable, List, NamedTuple, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchStats(NamedTuple):
+    files: int
+    bytes: int
+    seconds: float
+
+
+class LaunchPrefetcher:
+    """Pulls the files a game loads first into the page cache while the
+    emulator starts, so cold launches from slow disks or network shares
+    don't fault them in piece by piece.
+
+    Where available, the kernel is asked to read ahead with
+    `posix_fadvise(POSIX_FADV_WILLNEED)`. Elsewhere the files are read
+    sequentially in the background. At most `byte_budget` bytes are prefetched
+    per launch, in the order the files are given.
+    """
+
+    DEFAULT_BYTE_BUDGET = 512 * 1024 * 1024
+    # Globs relative to the EBOOT.BIN directory, for the modules most games
+    # load right after the executable
+    DEFAULT_HOT_FILES = ("*.sprx", "*.self")
+    READ_CHUNK_SIZE = 1024 * 1024
+    USE_FADVISE = hasattr(os, "posix_fadvise")
+
+    def __init__(
+        self,
+        byte_budget: int = DEFAULT_BYTE_BUDGET,
+        hot_files: Sequence[str] = DEFAULT_HOT_FILES,
+    ):
+        self.byte_budget = byte_budget
+        self.hot_files = hot_files
+
+        # Reads mustn't compete with library scans for worker threads
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="rpcs3-prefetch"
+        )
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    def files_for(self, eboot_file: str) -> List[str]:
+        """Returns the EBOOT.BIN followed by the hot files next to it."""
+        directory = path.dirname(eboot_file)
+        files = [eboot_file]
+
+        for pattern in self.hot_files:
+            files.extend(sorted(glob.glob(path.join(directory, pattern))))
+
+        return list(dict.fromkeys(files))
+
+    def _prefetch_file(self, file_path: str, length: int) -> int:
+        with open(file_path, "rb") as file:
+            if LaunchPrefetcher.USE_FADVISE:
+                os.posix_fadvise(file.fileno(), 0, length, os.POSIX_FADV_WILLNEED)
+                return length
+
+            buffer = bytearray(min(length, LaunchPrefetcher.READ_CHUNK_SIZE))
+            remaining = length
+            while remaining > 0:
+                read = file.readinto(buffer)
+                if not read:
+                    break
+                remaining -= read
+
+            return length - max(remaining, 0)
+
+    def prefetch_files(self, files: Iterable[str]) -> PrefetchStats:
+        started_at = time.perf_counter()
+        budget = self.byte_budget
+        prefetched_files = 0
+
+        for file_path in files:
+            if budget <= 0:
+                break
+
+            try:
+                length = min(os.stat(file_path).st_size, budget)
+                budget -= self._prefetch_file(file_path, length)
+            except OSError as error:
+                logger.debug("Failed to prefetch %s: %r", file_path, error)
+                continue
+
+            prefetched_files += 1
+
+        return PrefetchStats(
+            prefetched_files,
+            self.byte_budget - budget,
+            time.perf_counter() - started_at,
+        )
+
+    async def prefetch(self, eboot_file: str) -> PrefetchStats:
+        loop = asyncio.get_running_loop()
+
+        def run() -> PrefetchStats:
+            return self.prefetch_files(self.files_for(eboot_file))
+
+        return await loop.run_in_executor(self._executor, run)
@@ -0,0 +1,143 @@
+import json
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from galaxy.api.consts import LocalGameState
+from galaxy.api.plugin import Plugin
+from galaxy.api.types import Game, LicenseInfo, LicenseType, LocalGame
+
+from .rpcs3 import LibraryStamps, RPCS3Game
+
+
+def to_gog_game(game_id: str, title: str) -> Game:
+    return Game(game_id, title, None, LicenseInfo(LicenseType.SinglePurchase))
+
+
+class GameRecord(NamedTuple):
+    # The per-game fields Galaxy is told about
+    title: str
+    local_state: LocalGameState
+
+
+class LibrarySnapshot:
+    """Compact record of the games last reported to Galaxy.
+
+    `stamps` are the library stamps (see `RPCS3.read_library_stamps`) the games
+    were scanned at, which tells whether the snapshot is still current.
+    """
+
+    def __init__(self, games: Dict[str, GameRecord], stamps: Optional[LibraryStamps]):
+        # Records by game ID
+        self.games = games
+        self.stamps = stamps
+
+    @staticmethod
+    def from_games(
+        games: Iterable[RPCS3Game],
+        stamps: Optional[LibraryStamps],
+        local_state: Callable[[str], LocalGameState],
+    ) -> "LibrarySnapshot":
+        return LibrarySnapshot(
+            {game.id: GameRecord(game.title, local_state(game.id)) for game in games},
+            stamps,
+        )
+
+    def diff(self, newer: "LibrarySnapshot") -> "LibraryDiff":
+        return LibraryDiff.compute(self.games, newer.games)
+
+    def serialize(self) -> str:
+        """Serializes the snapshot to be persisted. Running states are left out,
+        since they won't hold by the time the snapshot is restored."""
+        return json.dumps(
+            {
+                "stamps": self.stamps,
+                "games": [
+                    (
+                        game_id,
+                        record.title,
+                        (record.local_state & ~LocalGameState.Running).value,
+                    )
+                    for game_id, record in self.games.items()
+                ],
+            },
+            separators=(",", ":"),
+        )
+
+    @staticmethod
+    def deserialize(data: Optional[str]) -> Optional["LibrarySnapshot"]:
+        """Returns None if `data` is missing or isn't a valid snapshot."""
+        if not data:
+            return None
+
+        try:
+            snapshot = json.loads(data)
+            games = {
+                str(game_id): GameRecord(str(title), LocalGameState(local_state))
+                for game_id, title, local_state in snapshot["games"]
+            }
+
+            stamps = snapshot["stamps"]
+            if stamps is not None:
+                stamps = tuple(
+                    None if stamp is None else _to_stamp(stamp) for stamp in stamps
+                )
+        except (ValueError, TypeError, KeyError):
+            return None
+
+        return LibrarySnapshot(games, stamps)
+
+
+def _to_stamp(stamp) -> Tuple[int, int]:
+    mtime_ns, size = stamp
+    return (int(mtime_ns), int(size))
+
+
+class LibraryDiff:
+    """The notifications needed to bring Galaxy from one snapshot to another."""
+
+    def __init__(self):
+        self.added: List[Tuple[str, GameRecord]] = []
+        self.removed: List[str] = []
+        self.renamed: List[Tuple[str, str]] = []
+        self.state_changes: List[Tuple[str, LocalGameState]] = []
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.renamed or self.state_changes)
+
+    @staticmethod
+    def compute(
+        older: Dict[str, GameRecord], newer: Dict[str, GameRecord]
+    ) -> "LibraryDiff":
+        """Compares two snapshots by game ID in a single pass over each."""
+        diff = LibraryDiff()
+
+        for game_id in older:
+            if game_id not in newer:
+                diff.removed.append(game_id)
+
+        for game_id, record in newer.items():
+            previous = older.get(game_id)
+
+            if previous is None:
+                diff.added.append((game_id, record))
+                continue
+
+            if previous.title != record.title:
+                diff.renamed.append((game_id, record.title))
+            if previous.local_state != record.local_state:
+                diff.state_changes.append((game_id, record.local_state))
+
+        return diff
+
+    def apply(self, plugin: Plugin):
+        for game_id in self.removed:
+            plugin.remove_game(game_id)
+
+        for game_id, record in self.added:
+            plugin.add_game(to_gog_game(game_id, record.title))
+            plugin.update_local_game_status(LocalGame(game_id, record.local_state))
+
+        for game_id, title in self.renamed:
+            plugin.update_game(to_gog_game(game_id, title))
+
+        for game_id, local_state in self.state_changes:
+            plugin.update_local_game_status(LocalGame(game_id, local_state))
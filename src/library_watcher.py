@@ -0,0 +1,241 @@
+import abc
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import os
+import struct
+import sys
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .file_stamps import FileStamp, read_file_stamp
+
+
+class PathWatcher(abc.ABC):
+    """Waits for changes of a set of files or directories.
+
+    A watched directory is considered changed when entries are created in,
+    deleted from or moved into or out of it.
+    """
+
+    def __init__(self, paths: List[str]):
+        self.paths = list(paths)
+
+    def add_paths(self, paths: Iterable[str]):
+        """Watches further paths, such as files expected to appear."""
+        for path in paths:
+            if path not in self.paths:
+                self.paths.append(path)
+                self._add_path(path)
+
+    @abc.abstractmethod
+    def _add_path(self, path: str):
+        pass
+
+    @abc.abstractmethod
+    async def wait_for_change(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class StatPollingWatcher(PathWatcher):
+    """Fallback watcher comparing `(mtime, size)` of every path periodically."""
+
+    DEFAULT_INTERVAL = 5
+
+    def __init__(self, paths: List[str], interval: float = DEFAULT_INTERVAL):
+        super().__init__(paths)
+        self.interval = interval
+        self._stamps = self._read_stamps()
+
+    def _read_stamps(self) -> Dict[str, Optional[FileStamp]]:
+        return {path: read_file_stamp(path) for path in self.paths}
+
+    def _add_path(self, path: str):
+        self._stamps[path] = read_file_stamp(path)
+
+    async def wait_for_change(self):
+        while True:
+            await asyncio.sleep(self.interval)
+
+            stamps = self._read_stamps()
+            if stamps != self._stamps:
+                self._stamps = stamps
+                return
+
+
+class InotifyWatcher(PathWatcher):
+    """Linux watcher that is woken up by inotify events on the event loop.
+
+    Paths that don't exist yet are watched through their closest existing
+    ancestor until they are created. An overflowing event queue counts as a
+    change, since events may have been lost.
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+
+    DIRECTORY_MASK = (
+        IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_CLOSE_WRITE
+    )
+
+    EVENT_HEADER = struct.Struct("iIII")
+    READ_SIZE = 64 * 1024
+
+    def __init__(self, paths: List[str]):
+        super().__init__(paths)
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        # Maps watch descriptors to the paths watched through them, each with
+        # the name of the entry within the watched directory whose changes
+        # count, or None if any change in the directory counts
+        self._watches: Dict[int, List[Tuple[Optional[bytes], str]]] = {}
+        # Paths watched through an ancestor because they don't exist yet
+        self._pending: Set[str] = set()
+        try:
+            for path in paths:
+                self._add_watch(path)
+        except OSError:
+            self.close()
+            raise
+
+        self._changed = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(self._fd, self._read_events)
+
+    def _add_watch(self, path: str):
+        # Files are watched through their directory to survive atomic
+        # replacement, missing paths through their closest existing ancestor
+        if os.path.isdir(path) or not os.path.exists(path):
+            directory, name = path, None
+        else:
+            directory, name = os.path.split(path)
+
+        pending = False
+        while True:
+            watch = self._libc.inotify_add_watch(
+                self._fd,
+                os.fsencode(directory),
+                InotifyWatcher.DIRECTORY_MASK | InotifyWatcher.IN_ONLYDIR,
+            )
+            if watch >= 0:
+                break
+
+            error = ctypes.get_errno()
+            if error not in (errno.ENOENT, errno.ENOTDIR):
+                raise OSError(error, "inotify_add_watch failed", directory)
+
+            # Wait for the missing directory to be created in its parent
+            parent, child = os.path.split(directory)
+            if parent == directory:
+                return
+            directory, name, pending = parent, child, True
+
+        if pending:
+            self._pending.add(path)
+        else:
+            self._pending.discard(path)
+
+        self._watches.setdefault(watch, []).append(
+            (None if name is None else os.fsencode(name), path)
+        )
+
+    def _add_path(self, path: str):
+        try:
+            self._add_watch(path)
+        except OSError:
+            pass
+
+    def _remove_path(self, watch: int, path: str):
+        entries = [entry for entry in self._watches[watch] if entry[1] != path]
+        if entries:
+            self._watches[watch] = entries
+        else:
+            del self._watches[watch]
+            self._libc.inotify_rm_watch(self._fd, watch)
+
+    def _read_events(self):
+        try:
+            data = os.read(self._fd, InotifyWatcher.READ_SIZE)
+        except BlockingIOError:
+            return
+
+        # Paths to watch again, because they appeared or their watch is gone
+        rewatched: List[str] = []
+
+        header_size = InotifyWatcher.EVENT_HEADER.size
+        offset = 0
+        while offset < len(data):
+            watch, mask, _cookie, name_length = InotifyWatcher.EVENT_HEADER.unpack_from(
+                data, offset
+            )
+            offset += header_size
+            name = data[offset : offset + name_length].rstrip(b"\0")
+            offset += name_length
+
+            if mask & InotifyWatcher.IN_Q_OVERFLOW:
+                self._changed.set()
+                continue
+
+            if watch not in self._watches:
+                continue
+
+            if mask & InotifyWatcher.IN_IGNORED:
+                # The watched directory was deleted or unmounted
+                rewatched.extend(path for _name, path in self._watches.pop(watch))
+                self._changed.set()
+                continue
+
+            for watched_name, path in self._watches[watch]:
+                if watched_name is not None and watched_name != name:
+                    continue
+
+                self._changed.set()
+                if path in self._pending:
+                    self._remove_path(watch, path)
+                    rewatched.append(path)
+
+        for path in dict.fromkeys(rewatched):
+            try:
+                self._add_watch(path)
+            except OSError:
+                pass
+
+    async def wait_for_change(self):
+        await self._changed.wait()
+        self._changed.clear()
+
+    def close(self):
+        if self._fd < 0:
+            return
+
+        if hasattr(self, "_loop"):
+            self._loop.remove_reader(self._fd)
+        os.close(self._fd)
+        self._fd = -1
+
+
+def create_path_watcher(paths: List[str]) -> PathWatcher:
+    """Creates an inotify-based watcher on Linux and a polling one elsewhere.
+
+    Must be called from within the event loop.
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            pass
+
+    return StatPollingWatcher(paths)
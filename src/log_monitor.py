@@ -0,0 +1,238 @@
+import asyncio
+import logging
+import os
+import re
+import time
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LogTailer:
+    """Reads the lines appended to a log file since the previous read.
+
+    The file is followed by offset, so every byte is read once. It is read
+    from the start again when a different file appears at the path, when it
+    shrinks, or when the bytes just before the offset have changed, which is
+    how a truncated log that has already grown back is told apart.
+    """
+
+    # Bytes before the offset compared to detect rewritten files
+    CHECK_SIZE = 64
+    # Bytes read from the end of the file on the first read
+    INITIAL_READ_LIMIT = 1024 * 1024
+
+    def __init__(self, path: str):
+        self.path = path
+
+        # Incremented whenever the file is read from the start again
+        self.restarts = 0
+
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._offset = 0
+        self._check_bytes = b""
+        self._partial_line = b""
+
+    def _restart(self, file_id: Optional[Tuple[int, int]]):
+        self._file_id = file_id
+        self._offset = 0
+        self._check_bytes = b""
+        self._partial_line = b""
+        self.restarts += 1
+
+    def _is_same_file(self, file, stat: os.stat_result) -> bool:
+        if (stat.st_dev, stat.st_ino) != self._file_id:
+            return False
+        if stat.st_size < self._offset:
+            return False
+
+        file.seek(self._offset - len(self._check_bytes))
+        return file.read(len(self._check_bytes)) == self._check_bytes
+
+    def read_lines(self) -> List[str]:
+        try:
+            stat = os.stat(self.path)
+            file_id = (stat.st_dev, stat.st_ino)
+            if file_id == self._file_id and stat.st_size == self._offset:
+                # Nothing was appended
+                return []
+
+            file = open(self.path, "rb")
+        except FileNotFoundError:
+            if self._file_id is not None:
+                self._restart(None)
+            return []
+
+        with file:
+            stat = os.fstat(file.fileno())
+            file_id = (stat.st_dev, stat.st_ino)
+
+            skip_partial_line = False
+            if self._file_id is None and self.restarts == 0:
+                # Skip most of a large existing log
+                self._file_id = file_id
+                self._offset = max(0, stat.st_size - LogTailer.INITIAL_READ_LIMIT)
+                skip_partial_line = self._offset > 0
+            elif not self._is_same_file(file, stat):
+                self._restart(file_id)
+
+            if stat.st_size == self._offset:
+                return []
+
+            file.seek(self._offset)
+            data = file.read(stat.st_size - self._offset)
+
+        self._offset += len(data)
+        self._check_bytes = (self._check_bytes + data)[-LogTailer.CHECK_SIZE :]
+
+        lines = (self._partial_line + data).split(b"\n")
+        self._partial_line = lines.pop()
+        if skip_partial_line and lines:
+            lines.pop(0)
+
+        return [line.rstrip(b"\r").decode("utf-8", errors="replace") for line in lines]
+
+
+class EmulationSession(NamedTuple):
+    title_id: str
+    seconds: float
+
+
+class EmulationLogMonitor:
+    """Detects which title RPCS3 is emulating by following RPCS3.log.
+
+    This also covers games started from RPCS3 itself rather than Galaxy.
+    `on_changed` is called with the title ID whenever emulation of a title
+    boots or stops, and `on_session` with every finished session. Neither is
+    called for what was logged before monitoring started.
+    """
+
+    DEFAULT_INTERVAL = 1
+
+    SERIAL = re.compile(r"\bSYS: Serial: (\S+)")
+    BOOTED = re.compile(r"\bSYS: Boot successful")
+    STOPPED = re.compile(r"\bSYS: (?:Stopping emulator|Emulation stopped)")
+    # Time since RPCS3 started, which prefixes every line
+    ELAPSED = re.compile(r"^\S*\s*(\d+):(\d{2}):(\d{2}(?:\.\d+)?)\s")
+
+    def __init__(
+        self,
+        log_file: str,
+        on_changed: Callable[[str], None],
+        on_session: Optional[Callable[[EmulationSession], None]] = None,
+    ):
+        self.tailer = LogTailer(log_file)
+        self._on_changed = on_changed
+        self._on_session = on_session
+
+        self.running_title_id: Optional[str] = None
+        self._serial: Optional[str] = None
+        # Log time and monotonic time of the boot of the running title, the
+        # latter None for boots logged before monitoring started
+        self._booted_at: Tuple[Optional[float], Optional[float]] = (None, None)
+        self._notify = True
+
+    @staticmethod
+    def _elapsed(line: str) -> Optional[float]:
+        match = EmulationLogMonitor.ELAPSED.match(line)
+        if match is None:
+            return None
+
+        hours, minutes, seconds = match.groups()
+        return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+    def _stop(self, elapsed: Optional[float]):
+        title_id = self.running_title_id
+        if title_id is None:
+            return
+
+        booted_elapsed, booted_at = self._booted_at
+        seconds: Optional[float] = None
+        if elapsed is not None and booted_elapsed is not None:
+            seconds = elapsed - booted_elapsed
+        elif booted_at is not None:
+            seconds = time.monotonic() - booted_at
+
+        self.running_title_id = None
+        if not self._notify:
+            return
+
+        self._on_changed(title_id)
+        if self._on_session is not None and seconds is not None:
+            self._on_session(EmulationSession(title_id, seconds))
+
+    def feed(self, lines: List[str]):
+        for line in lines:
+            if "SYS: " not in line:
+                continue
+
+            match = EmulationLogMonitor.SERIAL.search(line)
+            if match is not None:
+                self._serial = match.group(1)
+            elif EmulationLogMonitor.BOOTED.search(line):
+                if self._serial is None or self._serial == self.running_title_id:
+                    continue
+
+                self._stop(self._elapsed(line))
+                self.running_title_id = self._serial
+                self._booted_at = (
+                    self._elapsed(line),
+                    time.monotonic() if self._notify else None,
+                )
+                if self._notify:
+                    self._on_changed(self.running_title_id)
+            elif EmulationLogMonitor.STOPPED.search(line):
+                self._stop(self._elapsed(line))
+                self._serial = None
+
+    def backfill(self, lines: List[str]):
+        """Takes the state from lines logged before monitoring started, without
+        reporting their boots, stops and sessions again.
+
+        A title left running by the backfill may belong to an RPCS3 that has
+        crashed since, so it should only be trusted while an RPCS3 process is
+        alive, and dropped with `abandon` otherwise.
+        """
+        self._notify = False
+        try:
+            self.feed(lines)
+        finally:
+            self._notify = True
+
+    def abandon(self):
+        """Forgets the running title without reporting it as stopped, for when
+        RPCS3 has exited without logging the stop."""
+        self.running_title_id = None
+        self._serial = None
+        self._booted_at = (None, None)
+
+    def _handle_lines(self, restarts: int, lines: List[str]):
+        if self.tailer.restarts != restarts:
+            # A new log means RPCS3 was restarted
+            self._stop(None)
+            self._serial = None
+
+        self.feed(lines)
+
+    async def run(self, interval: float = DEFAULT_INTERVAL):
+        """Polls the log every `interval` seconds, which costs a single stat
+        call while nothing is appended."""
+        loop = asyncio.get_running_loop()
+        backfilled = False
+
+        while True:
+            restarts = self.tailer.restarts
+            try:
+                lines = await loop.run_in_executor(None, self.tailer.read_lines)
+            except OSError as error:
+                logger.debug("Failed to read %s: %r", self.tailer.path, error)
+                lines = []
+
+            if backfilled:
+                self._handle_lines(restarts, lines)
+            else:
+                # The first read returns the tail of the existing log
+                self.backfill(lines)
+                backfilled = True
+
+            await asyncio.sleep(interval)
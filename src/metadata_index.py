@@ -0,0 +1,190 @@
+import logging
+import os
+import struct
+from typing import Collection, Iterable, List, NamedTuple, Optional
+
+from .file_stamps import StampedDatabase, file_stamp
+from .sfo import CompactSfo, Sfo, decode_sfo_file
+
+logger = logging.getLogger(__name__)
+
+
+class SfoMetadata(NamedTuple):
+    path: str
+    mtime_ns: int
+    size: int
+    title: Optional[str]
+    title_id: Optional[str]
+    category: Optional[str]
+    app_version: Optional[str]
+
+    # Maps SFO keys to the fields stored in the index
+    SFO_FIELDS = {
+        "TITLE": "title",
+        "TITLE_ID": "title_id",
+        "CATEGORY": "category",
+        "APP_VER": "app_version",
+    }
+
+    @staticmethod
+    def from_sfo(path: str, stat: os.stat_result, sfo: Sfo) -> "SfoMetadata":
+        def get(key: str) -> Optional[str]:
+            try:
+                return sfo.get_string(key)
+            except KeyError:
+                return None
+
+        return SfoMetadata(
+            path,
+            stat.st_mtime_ns,
+            stat.st_size,
+            get("TITLE"),
+            get("TITLE_ID"),
+            get("CATEGORY"),
+            get("APP_VER"),
+        )
+
+    def to_sfo(self) -> CompactSfo:
+        mapping = {
+            key: getattr(self, field)
+            for key, field in SfoMetadata.SFO_FIELDS.items()
+            if getattr(self, field) is not None
+        }
+
+        return CompactSfo(mapping)
+
+    def matches(self, stat: os.stat_result) -> bool:
+        return (self.mtime_ns, self.size) == file_stamp(stat)
+
+
+class SfoMetadataIndex(StampedDatabase):
+    """Persistent index of decoded PARAM.SFO metadata.
+
+    Rows are keyed by SFO path and validated against the file's
+    `(st_mtime_ns, st_size)`, so a file is only decoded when it is new or has
+    changed since it was last indexed.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sfo_metadata (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            title TEXT,
+            title_id TEXT,
+            category TEXT,
+            app_version TEXT
+        );
+        CREATE INDEX IF NOT EXISTS sfo_metadata_title_id ON sfo_metadata (title_id);
+        CREATE INDEX IF NOT EXISTS sfo_metadata_category ON sfo_metadata (category);
+    """
+
+    COLUMNS = "path, mtime_ns, size, title, title_id, category, app_version"
+
+    def _select(self, where: str, *params) -> List[SfoMetadata]:
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {SfoMetadataIndex.COLUMNS} FROM sfo_metadata WHERE {where}",
+                params,
+            ).fetchall()
+
+        return [SfoMetadata(*row) for row in rows]
+
+    def _store(self, metadata: SfoMetadata):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sfo_metadata "
+                f"({SfoMetadataIndex.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                metadata,
+            )
+
+    def _remove(self, paths: Collection[str]):
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM sfo_metadata WHERE path = ?",
+                [(path,) for path in paths],
+            )
+
+    def _decode(self, path: str, stat: os.stat_result) -> SfoMetadata:
+        sfo = decode_sfo_file(path, keys=SfoMetadata.SFO_FIELDS.keys())
+        metadata = SfoMetadata.from_sfo(path, stat, sfo)
+        self._store(metadata)
+
+        return metadata
+
+    def lookup(self, path: str, stat: Optional[os.stat_result] = None) -> SfoMetadata:
+        """Returns the metadata of the SFO at `path`, decoding it if the indexed
+        row is missing or stale.
+
+        `stat` may be passed if the caller has already stat'ed the file.
+        """
+        if stat is None:
+            stat = os.stat(path)
+
+        rows = self._select("path = ?", path)
+        if rows and rows[0].matches(stat):
+            return rows[0]
+
+        return self._decode(path, stat)
+
+    def last_indexed(self, path: str) -> Optional[SfoMetadata]:
+        """Returns the row of the SFO at `path` without validating it, for files
+        that can't be stat'ed at the moment."""
+        rows = self._select("path = ?", path)
+        return rows[0] if rows else None
+
+    def by_title_id(self, title_id: str) -> List[SfoMetadata]:
+        return self._select("title_id = ?", title_id)
+
+    def by_category(self, category: str) -> List[SfoMetadata]:
+        return self._select("category = ?", category)
+
+    def retain(self, paths: Iterable[str]) -> List[str]:
+        """Drops the rows of all files but `paths`, such as of games removed
+        from the library. Returns the paths whose rows were removed."""
+        retained = set(paths)
+
+        with self._lock:
+            rows = self._connection.execute("SELECT path FROM sfo_metadata").fetchall()
+
+        removed = [path for (path,) in rows if path not in retained]
+        self._remove(removed)
+
+        return removed
+
+    def revalidate(self) -> List[str]:
+        """Checks every indexed file with a single `stat` call.
+
+        Changed files are decoded again. Rows of deleted files and of files that
+        can no longer be decoded are dropped. Returns the paths whose rows were
+        updated or removed.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {SfoMetadataIndex.COLUMNS} FROM sfo_metadata"
+            ).fetchall()
+
+        changed = []
+        removed = []
+        for metadata in map(SfoMetadata._make, rows):
+            try:
+                stat = os.stat(metadata.path)
+            except FileNotFoundError:
+                removed.append(metadata.path)
+                continue
+
+            if metadata.matches(stat):
+                continue
+
+            try:
+                self._decode(metadata.path, stat)
+            except (OSError, ValueError, KeyError, struct.error) as error:
+                logger.warning("Failed to decode %s: %r", metadata.path, error)
+                removed.append(metadata.path)
+                continue
+
+            changed.append(metadata.path)
+
+        self._remove(removed)
+
+        return changed + removed
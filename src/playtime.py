@@ -0,0 +1,140 @@
+import logging
+import os
+from datetime import datetime
+from threading import Lock
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from .file_stamps import FileStamp, file_stamp
+
+logger = logging.getLogger(__name__)
+
+MONTHS = {
+    name: number
+    for number, name in enumerate(
+        [
+            "January",
+            "February",
+            "March",
+            "April",
+            "May",
+            "June",
+            "July",
+            "August",
+            "September",
+            "October",
+            "November",
+            "December",
+        ],
+        start=1,
+    )
+}
+
+
+class GamePlaytime(NamedTuple):
+    minutes: Optional[int]
+    # Unix timestamp
+    last_played: Optional[int]
+
+
+def parse_last_played(value: str) -> Optional[int]:
+    """Converts RPCS3's `MMMM d yyyy` or `MMMM d yyyy HH:mm` dates, written in
+    local time, to a unix timestamp."""
+    parts = value.split()
+    if len(parts) not in (3, 4) or parts[0] not in MONTHS:
+        return None
+
+    try:
+        hour, minute = 0, 0
+        if len(parts) == 4:
+            hour, minute = (int(part) for part in parts[3].split(":"))
+
+        date = datetime(int(parts[2]), MONTHS[parts[0]], int(parts[1]), hour, minute)
+        return int(date.timestamp())
+    except (ValueError, OverflowError):
+        return None
+
+
+def _unquote(value: str) -> str:
+    # QSettings quotes strings with surrounding spaces or separators
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1]
+
+    return value
+
+
+def parse_persistent_settings(lines: Iterable[str]) -> Dict[str, GamePlaytime]:
+    """Reads the playtime of each title from the lines of RPCS3's
+    `persistent_settings.dat`, a QSettings INI file.
+
+    Playtime is stored in milliseconds under `[Playtime]` and the date of the
+    last session under `[LastPlayed]`, both keyed by title ID.
+    """
+    playtime: Dict[str, int] = {}
+    last_played: Dict[str, int] = {}
+
+    section = None
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] == ";":
+            continue
+
+        if line[0] == "[" and line[-1] == "]":
+            section = line[1:-1]
+            continue
+
+        key, separator, value = line.partition("=")
+        if not separator:
+            continue
+
+        key, value = key.strip(), _unquote(value.strip())
+
+        if section == "Playtime":
+            try:
+                playtime[key] = int(value)
+            except ValueError:
+                logger.debug("Skipping malformed playtime of %s: %r", key, value)
+        elif section == "LastPlayed":
+            timestamp = parse_last_played(value)
+            if timestamp is not None:
+                last_played[key] = timestamp
+
+    return {
+        title_id: GamePlaytime(
+            playtime[title_id] // 60000 if title_id in playtime else None,
+            last_played.get(title_id),
+        )
+        for title_id in playtime.keys() | last_played.keys()
+    }
+
+
+class PlaytimeReader:
+    """Reads the playtime RPCS3 keeps in its persistent settings.
+
+    The file is only parsed again once its `(mtime_ns, size)` changes.
+    """
+
+    def __init__(self, settings_file: str):
+        self.settings_file = settings_file
+
+        self._stamp: Optional[FileStamp] = None
+        self._playtime: Dict[str, GamePlaytime] = {}
+        self._lock = Lock()
+
+    def read(self) -> Dict[str, GamePlaytime]:
+        """Returns the playtime by title ID, which is empty if RPCS3 hasn't
+        recorded any."""
+        with self._lock:
+            try:
+                stamp = file_stamp(os.stat(self.settings_file))
+            except FileNotFoundError:
+                self._stamp, self._playtime = None, {}
+                return self._playtime
+
+            if stamp != self._stamp:
+                with open(
+                    self.settings_file, encoding="utf-8", errors="replace"
+                ) as settings:
+                    self._playtime = parse_persistent_settings(settings)
+                self._stamp = stamp
+
+            return self._playtime
@@ -0,0 +1,98 @@
+import asyncio
+from os import path
+from typing import Callable, Dict, Iterable, List, Mapping, Set
+
+from galaxy.proc_tools import ProcessInfo
+
+
+def is_rpcs3_binary(binary_path: str) -> bool:
+    return "rpcs3" in path.basename(binary_path).lower()
+
+
+def _normalize_path(file_path: str) -> str:
+    return path.normcase(path.normpath(file_path))
+
+
+def games_in_processes(
+    processes: Iterable[ProcessInfo], eboot_game_ids: Mapping[str, str]
+) -> Set[str]:
+    """Returns the IDs of the games whose EBOOT.BIN, mapped to the game ID in
+    `eboot_game_ids` by normalized path, was passed to any of the processes."""
+    game_ids = set()
+
+    for process in processes:
+        for argument in process.command_line or ():
+            game_id = eboot_game_ids.get(_normalize_path(argument))
+            if game_id is not None:
+                game_ids.add(game_id)
+
+    return game_ids
+
+
+def eboot_game_ids(eboot_files: Mapping[str, str]) -> Dict[str, str]:
+    """Indexes game IDs by the normalized paths of their EBOOT.BIN, given the
+    EBOOT.BIN paths by game ID."""
+    return {
+        _normalize_path(eboot_file): game_id
+        for game_id, eboot_file in eboot_files.items()
+    }
+
+
+class ProcessTracker:
+    """Keeps track of which games are running, by game ID.
+
+    Processes launched by the plugin are watched directly: exits are detected
+    by awaiting the child process, which relies on the event loop's child
+    watcher instead of polling. Games running outside of those, such as games
+    started from RPCS3 itself, are reported per source with `set_external`.
+    `on_changed` is called with the game ID whenever a game starts or stops
+    running, once no matter how many sources report it.
+    """
+
+    def __init__(self, on_changed: Callable[[str], None]):
+        self._on_changed = on_changed
+
+        self._processes: Dict[str, asyncio.subprocess.Process] = {}
+        # Game IDs reported as running by each external source
+        self._external: Dict[str, Set[str]] = {}
+
+    def is_running(self, game_id: str) -> bool:
+        if game_id in self._processes:
+            return True
+
+        return any(game_id in game_ids for game_ids in self._external.values())
+
+    @property
+    def running_game_ids(self) -> List[str]:
+        game_ids = dict.fromkeys(self._processes)
+        for external_game_ids in self._external.values():
+            game_ids.update(dict.fromkeys(external_game_ids))
+
+        return list(game_ids)
+
+    def set_external(self, source: str, game_ids: Iterable[str]):
+        """Replaces the games that `source` reports as running."""
+        game_ids = set(game_ids)
+        affected = self._external.get(source, set()) ^ game_ids
+        was_running = {game_id: self.is_running(game_id) for game_id in affected}
+
+        self._external[source] = game_ids
+
+        for game_id in affected:
+            if self.is_running(game_id) != was_running[game_id]:
+                self._on_changed(game_id)
+
+    async def watch(self, game_id: str, process: asyncio.subprocess.Process):
+        """Reports the game as started and waits until its process exits."""
+        was_running = self.is_running(game_id)
+        self._processes[game_id] = process
+        if not was_running:
+            self._on_changed(game_id)
+
+        await process.wait()
+
+        # The game might have been launched again in the meantime
+        if self._processes.get(game_id) is process:
+            del self._processes[game_id]
+            if not self.is_running(game_id):
+                self._on_changed(game_id)
@@ -1,78 +1,710 @@
-import io
-import subprocess
+import asyncio
+import functools
+import itertools
+import logging
+import os
+import struct
+import sys
+import time
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ThreadPoolExecutor
 from os import path
 
-from typing import List
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
 
-from .sfo import decode_sfo_file
+from .directory_size import DirectorySizeCalculator
+from .file_stamps import FileStamp, read_file_stamp
+from .games_yaml import read_games_yaml
+from .install_state import InstallStateChecker
+from .launch_prefetch import LaunchPrefetcher
+from .metadata_index import SfoMetadataIndex
+from .playtime import GamePlaytime, PlaytimeReader
+from .sfo import CompactSfo, Sfo, SfoCategories, decode_sfo_file
+from .sfo_cache import shared_sfo_cache
+from .trophies import TrophyCache, UnlockedTrophy
+from .trophy_catalog import TrophyCatalog, read_trophy_names
+
+logger = logging.getLogger(__name__)
+
+# (mtime, size) of games.yml and dev_hdd0/game, None for missing ones, and the
+# summed (mtime, size) of the PARAM.SFO files in dev_hdd0/game
+LibraryStamps = Tuple[Optional[FileStamp], ...]
+
+
+class Hdd0Entry(NamedTuple):
+    name: str
+    directory: str
+    # Stat result of the entry's PARAM.SFO, None if it is missing
+    sfo_stat: Optional[os.stat_result]
+
+
+class LibraryScan:
+    def __init__(
+        self,
+        games: List["RPCS3Game"],
+        failures: Dict[str, Exception],
+        stamps: Optional[LibraryStamps],
+        installed: Dict[str, bool],
+        pending_files: List[str],
+    ):
+        # Games whose metadata could be read
+        self.games = games
+        # Maps IDs of games with unreadable metadata to the raised error
+        self.failures = failures
+        # Library stamps the games were read at
+        self.stamps = stamps
+        # Whether the EBOOT.BIN of each game was found, by game ID
+        self.installed = installed
+        # SFOs of dev_hdd0/game entries that couldn't be read yet, such as of
+        # PKGs still being installed, to be watched for changes
+        self.pending_files = pending_files
 
 
 class RPCS3:
     FILENAME_GAMES_YAML = "games.yml"
+    FILENAME_PERSISTENT_SETTINGS = "persistent_settings.dat"
+    FILENAME_TROPUSR = "TROPUSR.DAT"
+    FILENAME_TROPCONF = "TROPCONF.SFM"
+    FILENAME_LOG = "RPCS3.log"
+    DEFAULT_SCAN_WORKERS = 8
+    # Seconds for which a finished scan is handed out to further callers
+    SCAN_REUSE_SECONDS = 0.5
 
-    def __init__(self, executable: str, config_directory: str):
+    def __init__(
+        self,
+        executable: str,
+        config_directory: str,
+        metadata_index: Optional[SfoMetadataIndex] = None,
+        scan_workers: int = DEFAULT_SCAN_WORKERS,
+        trophy_catalog: Optional[TrophyCatalog] = None,
+        launch_prefetcher: Optional[LaunchPrefetcher] = None,
+    ):
         self.executable = executable
         self.config_directory = config_directory
+        self.metadata_index = metadata_index
+        self.trophy_catalog = trophy_catalog
+        self.launch_prefetcher = launch_prefetcher
+
+        # Games by ID, and the library stamps they were read at
+        self._games_by_id: Dict[str, RPCS3Game] = {}
+        self._library_stamps: Optional[LibraryStamps] = None
+        self._pending_sfo_files: List[str] = []
+        self._library_sfo_files: List[str] = []
+
+        self._scan_task: Optional[asyncio.Future] = None
+        self._scan_finished_at = 0.0
+
+        self._scan_executor = ThreadPoolExecutor(
+            max_workers=scan_workers, thread_name_prefix="rpcs3-scan"
+        )
+        self.install_state_checker = InstallStateChecker()
+        self.directory_sizes = DirectorySizeCalculator()
+        self.playtime = PlaytimeReader(self.persistent_settings_file)
+        self.trophies = TrophyCache()
+
+    def close(self):
+        self._scan_executor.shutdown(wait=False)
+        self.install_state_checker.close()
+        self.directory_sizes.close()
+        if self.launch_prefetcher is not None:
+            self.launch_prefetcher.close()
 
     @property
     def games_file(self) -> str:
         return path.join(self.config_directory, RPCS3.FILENAME_GAMES_YAML)
 
-    def _run_with_arguments(self, args: List[str]):
-        return subprocess.run([self.executable] + args)
+    @property
+    def hdd0_game_directory(self) -> str:
+        return path.join(self.config_directory, "dev_hdd0", "game")
+
+    @property
+    def log_file(self) -> str:
+        return path.join(self.config_directory, RPCS3.FILENAME_LOG)
+
+    @property
+    def hdd0_home_directory(self) -> str:
+        return path.join(self.config_directory, "dev_hdd0", "home")
+
+    @property
+    def persistent_settings_file(self) -> str:
+        return path.join(
+            self.config_directory, "GuiConfigs", RPCS3.FILENAME_PERSISTENT_SETTINGS
+        )
+
+    async def _start_with_arguments(self, args: List[str]):
+        return await asyncio.create_subprocess_exec(self.executable, *args)
+
+    def _parse_games_file(self) -> List["RPCS3Game"]:
+        if not path.exists(self.games_file):
+            return []
+
+        errors = []
+        games = [
+            RPCS3Game(game_id, directory, self.metadata_index)
+            for game_id, directory in read_games_yaml(self.games_file, errors)
+        ]
+
+        for error in errors:
+            logger.warning("Skipping malformed entry in %s: %s", self.games_file, error)
+
+        return games
+
+    def _list_hdd0_entries(self) -> List[Hdd0Entry]:
+        """Lists the directories in dev_hdd0/game with the stat result of their
+        PARAM.SFO, with one stat per entry."""
+        entries: List[Hdd0Entry] = []
+
+        try:
+            directory_entries = os.scandir(self.hdd0_game_directory)
+        except FileNotFoundError:
+            return entries
+
+        with directory_entries:
+            for directory_entry in directory_entries:
+                if not directory_entry.is_dir():
+                    continue
+
+                try:
+                    stat = os.stat(path.join(directory_entry.path, "PARAM.SFO"))
+                except OSError:
+                    stat = None
+
+                entries.append(
+                    Hdd0Entry(directory_entry.name, directory_entry.path, stat)
+                )
+
+        return entries
+
+    def _load_hdd0_game(self, entry: Hdd0Entry) -> Optional["RPCS3HddGame"]:
+        """Reads the SFO of a dev_hdd0/game entry, returning None for entries
+        without a readable one, such as PKGs still being installed."""
+        if entry.sfo_stat is None:
+            return None
+
+        game = RPCS3HddGame(entry.name, entry.directory, self.metadata_index)
+        try:
+            game.load_metadata(entry.sfo_stat)
+        except (OSError, KeyError, ValueError) as error:
+            logger.debug("Skipping %s: %r", entry.directory, error)
+            return None
+
+        return game
+
+    def _merge_library(
+        self, disc_games: List["RPCS3Game"], hdd0_games: List["RPCS3HddGame"]
+    ) -> Dict[str, "RPCS3Game"]:
+        games_by_id = {game.id: game for game in disc_games}
+        attachments = []
+
+        for game in hdd0_games:
+            if game.category == SfoCategories.HDD_GAME:
+                # Games registered in games.yml take precedence
+                games_by_id.setdefault(game.id, game)
+            else:
+                attachments.append(game)
+
+        for content in attachments:
+            base_game = games_by_id.get(content.title_id)
+            if base_game is None:
+                continue
+
+            if content.category == SfoCategories.GAME_DATA:
+                base_game.updates += (content,)
+            elif content.category == SfoCategories.ADDITIONAL_CONTENT:
+                base_game.additional_content += (content,)
+
+        return games_by_id
+
+    def _read_index_stamps(self) -> LibraryStamps:
+        return (
+            read_file_stamp(self.games_file),
+            read_file_stamp(self.hdd0_game_directory),
+        )
+
+    def _read_library(self) -> Tuple[LibraryStamps, List[Hdd0Entry]]:
+        index_stamps = self._read_index_stamps()
+        entries = self._list_hdd0_entries()
+
+        # Sum of the SFO stamps, which changes whenever an entry gets its SFO
+        # or an SFO is rewritten, neither of which touches dev_hdd0/game itself
+        mtime_ns = size = 0
+        for entry in entries:
+            if entry.sfo_stat is not None:
+                mtime_ns += entry.sfo_stat.st_mtime_ns
+                size += entry.sfo_stat.st_size
+
+        return index_stamps + ((mtime_ns, size),), entries
+
+    def read_library_stamps(self) -> LibraryStamps:
+        return self._read_library()[0]
+
+    @property
+    def library_sfo_files(self) -> List[str]:
+        """The SFOs of the games in games.yml and of everything in
+        dev_hdd0/game, as of the last time the library was read."""
+        return self._library_sfo_files
+
+    def _reindex(
+        self,
+        stamps: LibraryStamps,
+        entries: List[Hdd0Entry],
+        hdd0_games: Iterable[Optional["RPCS3HddGame"]],
+    ):
+        loaded_games = []
+        pending_files = []
+        for entry, game in zip(entries, hdd0_games):
+            if game is None:
+                pending_files.append(path.join(entry.directory, "PARAM.SFO"))
+            else:
+                loaded_games.append(game)
+
+        disc_games = self._parse_games_file()
+        self._games_by_id = self._merge_library(disc_games, loaded_games)
+        self._pending_sfo_files = pending_files
+        self._library_sfo_files = [
+            game.sfo_file for game in itertools.chain(disc_games, loaded_games)
+        ]
+        self._library_stamps = stamps
+
+    def _indexed_games(self) -> Dict[str, "RPCS3Game"]:
+        """Returns games by ID for lookups, rereading the library only if
+        games.yml or the entries of dev_hdd0/game have changed.
+
+        This costs two stat calls. Changes within the entries of dev_hdd0/game
+        are left to scans.
+        """
+        stamps = self._library_stamps
+        if stamps is None or stamps[:2] != self._read_index_stamps():
+            stamps, entries = self._read_library()
+            self._reindex(stamps, entries, map(self._load_hdd0_game, entries))
+
+        return self._games_by_id
+
+    def read_games(self) -> List["RPCS3Game"]:
+        """Returns all games, rereading the library if games.yml, the entries
+        of dev_hdd0/game or their SFOs have changed."""
+        stamps, entries = self._read_library()
+        if stamps != self._library_stamps:
+            self._reindex(stamps, entries, map(self._load_hdd0_game, entries))
+
+        return list(self._games_by_id.values())
+
+    async def _read_games_concurrently(self) -> List["RPCS3Game"]:
+        """Like `read_games`, decoding the SFOs of dev_hdd0/game concurrently
+        on the scan executor."""
+        loop = asyncio.get_running_loop()
+
+        stamps, entries = await loop.run_in_executor(
+            self._scan_executor, self._read_library
+        )
+        if stamps != self._library_stamps:
+            hdd0_games = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        self._scan_executor, self._load_hdd0_game, entry
+                    )
+                    for entry in entries
+                )
+            )
+            await loop.run_in_executor(
+                self._scan_executor, self._reindex, stamps, entries, hdd0_games
+            )
+
+        return list(self._games_by_id.values())
+
+    async def scan_games(self, max_age: Optional[float] = None) -> LibraryScan:
+        """Reads all games and loads their metadata concurrently on the scan
+        executor, without blocking the event loop.
+
+        Concurrent callers share a single scan, and a scan that finished less
+        than `max_age` seconds ago, `SCAN_REUSE_SECONDS` by default, is reused.
+        """
+        if max_age is None:
+            max_age = RPCS3.SCAN_REUSE_SECONDS
+
+        task = self._scan_task
+        if task is None or not self._is_scan_reusable(task, max_age):
+            task = asyncio.ensure_future(self._scan_games())
+            task.add_done_callback(self._on_scan_done)
+            self._scan_task = task
+
+        # Callers being cancelled mustn't cancel the scan shared with others
+        return await asyncio.shield(task)
+
+    def _is_scan_reusable(self, task: asyncio.Future, max_age: float) -> bool:
+        if not task.done():
+            return True
+
+        if task.cancelled() or task.exception() is not None:
+            return False
+
+        return time.monotonic() - self._scan_finished_at <= max_age
+
+    def _on_scan_done(self, task: asyncio.Future):
+        self._scan_finished_at = time.monotonic()
+
+    async def _scan_games(self) -> LibraryScan:
+        loop = asyncio.get_running_loop()
+        games = await self._read_games_concurrently()
+
+        eboot_files = {game.id: game.find_eboot_file() for game in games}
+        eboot_exists = await self.install_state_checker.check(eboot_files.values())
+
+        async def load(game: RPCS3Game):
+            if isinstance(game, RPCS3HddGame):
+                # Read while listing dev_hdd0/game, and unchanged since as
+                # the SFO stamps tell
+                return
+
+            exists = eboot_exists[eboot_files[game.id]]
+            if not exists and not game.has_metadata:
+                # Fall back to what was indexed while the game was present, as
+                # after a restart with its drive unplugged
+                await loop.run_in_executor(
+                    self._scan_executor, game.restore_indexed_metadata
+                )
+            if not exists and game.has_metadata:
+                # Keep what is known about games on missing or dead storage
+                return
+            if exists is None:
+                raise StorageUnreachableError(
+                    f"Storage of {game.directory} is unreachable"
+                )
 
-    def read_games(self):
-        with io.open(self.games_file) as file:
-            file_content = file.read()
-            valid_yaml_lines = [
-                line for line in file_content.splitlines() if ": " in line
+            await loop.run_in_executor(self._scan_executor, game.load_metadata)
+
+        results = await asyncio.gather(
+            *(load(game) for game in games), return_exceptions=True
+        )
+
+        scanned_games = []
+        failures = {}
+        for game, result in zip(games, results):
+            if isinstance(result, Exception):
+                failures[game.id] = result
+            else:
+                scanned_games.append(game)
+
+        installed = {
+            game.id: eboot_exists[eboot_files[game.id]] is True
+            for game in scanned_games
+        }
+
+        return LibraryScan(
+            scanned_games,
+            failures,
+            self._library_stamps,
+            installed,
+            self._pending_sfo_files,
+        )
+
+    def get_game_by_id(self, game_id: str) -> "RPCS3Game":
+        try:
+            return self._indexed_games()[game_id]
+        except KeyError:
+            raise GameNotFoundError()
+
+    async def get_game_size(self, game_id: str) -> int:
+        """Returns the bytes allocated by a game, including patches and DLC."""
+        loop = asyncio.get_running_loop()
+        game = await loop.run_in_executor(
+            self._scan_executor, self.get_game_by_id, game_id
+        )
+        return await self.directory_sizes.size_of(game.content_directories)
+
+    async def read_playtime(self) -> Dict[str, GamePlaytime]:
+        """Returns the playtime RPCS3 recorded, by title ID."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._scan_executor, self.playtime.read)
+
+    def _user_directories(self) -> List[str]:
+        try:
+            with os.scandir(self.hdd0_home_directory) as entries:
+                return [entry.path for entry in entries if entry.is_dir()]
+        except FileNotFoundError:
+            return []
+
+    def _load_trophy_file(self, trophy_file: str) -> List[UnlockedTrophy]:
+        try:
+            return self.trophies.load(trophy_file) or []
+        except (OSError, ValueError, struct.error) as error:
+            logger.warning("Failed to read trophies from %s: %r", trophy_file, error)
+            return []
+
+    def _load_trophy_names(self, trophy_set: str, users: List[str]) -> Dict[int, str]:
+        """Returns the trophy names of a set from the first user that has its
+        TROPCONF.SFM, or no names if none can be read."""
+        for user in users:
+            config_file = path.join(user, "trophy", trophy_set, RPCS3.FILENAME_TROPCONF)
+
+            try:
+                if self.trophy_catalog is not None:
+                    return self.trophy_catalog.lookup(config_file)
+
+                return read_trophy_names(config_file)
+            except FileNotFoundError:
+                continue
+            except (OSError, ElementTree.ParseError, ValueError) as error:
+                logger.warning(
+                    "Failed to read trophy names from %s: %r", config_file, error
+                )
+
+        return {}
+
+    async def read_unlocked_trophies(
+        self, game_ids: Iterable[str]
+    ) -> Dict[str, List[UnlockedTrophy]]:
+        """Returns the trophies unlocked in each game, by game ID.
+
+        Trophies of all users are merged, keeping the earliest unlock time.
+        Every TROPUSR.DAT and TROPCONF.SFM is read at most once, even if games
+        share a set.
+        """
+        loop = asyncio.get_running_loop()
+
+        def run(function, *args):
+            return loop.run_in_executor(self._scan_executor, function, *args)
+
+        games = await run(self._indexed_games)
+        users = await run(self._user_directories)
+
+        async def find_trophy_sets(game_id: str) -> List[str]:
+            game = games.get(game_id)
+            if game is None:
+                return []
+
+            return await run(game.find_trophy_sets)
+
+        game_ids = list(dict.fromkeys(game_ids))
+        trophy_sets = await asyncio.gather(*map(find_trophy_sets, game_ids))
+
+        def trophy_file(user: str, trophy_set: str) -> str:
+            return path.join(user, "trophy", trophy_set, RPCS3.FILENAME_TROPUSR)
+
+        trophy_files = list(
+            dict.fromkeys(
+                trophy_file(user, trophy_set)
+                for game_sets in trophy_sets
+                for trophy_set in game_sets
+                for user in users
+            )
+        )
+        unlocked_by_file = dict(
+            zip(
+                trophy_files,
+                await asyncio.gather(
+                    *(run(self._load_trophy_file, file) for file in trophy_files)
+                ),
+            )
+        )
+
+        # Names are only needed for sets with unlocked trophies
+        named_sets = list(
+            dict.fromkeys(
+                trophy_set
+                for game_sets in trophy_sets
+                for trophy_set in game_sets
+                if any(
+                    unlocked_by_file[trophy_file(user, trophy_set)] for user in users
+                )
+            )
+        )
+        names_by_set = dict(
+            zip(
+                named_sets,
+                await asyncio.gather(
+                    *(
+                        run(self._load_trophy_names, trophy_set, users)
+                        for trophy_set in named_sets
+                    )
+                ),
+            )
+        )
+
+        unlocked_by_game = {}
+        for game_id, game_sets in zip(game_ids, trophy_sets):
+            # Maps trophy IDs to their earliest unlock time and name
+            unlocks: Dict[int, Tuple[int, Optional[str]]] = {}
+            for trophy_set in game_sets:
+                names = names_by_set.get(trophy_set, {})
+
+                for user in users:
+                    for trophy in unlocked_by_file[trophy_file(user, trophy_set)]:
+                        unlock = unlocks.get(trophy.trophy_id)
+                        if unlock is None or trophy.unlock_time < unlock[0]:
+                            unlocks[trophy.trophy_id] = (
+                                trophy.unlock_time,
+                                names.get(trophy.trophy_id),
+                            )
+
+            unlocked_by_game[game_id] = [
+                UnlockedTrophy(trophy_id, unlock_time, name)
+                for trophy_id, (unlock_time, name) in sorted(unlocks.items())
             ]
 
-            return [RPCS3Game.from_yaml_line(line) for line in valid_yaml_lines]
+        return unlocked_by_game
+
+    def _on_prefetch_done(self, game_id: str, task: asyncio.Future):
+        if task.cancelled():
+            return
 
-    def _get_game_by_id(self, game_id: str):
-        for game in self.read_games():
-            if game.id == game_id:
-                return game
+        error = task.exception()
+        if error is not None:
+            logger.warning("Failed to prefetch %s: %r", game_id, error)
+            return
 
-        raise GameNotFoundError()
+        stats = task.result()
+        logger.info(
+            "Prefetched %d files (%d bytes) of %s in %.3fs",
+            stats.files,
+            stats.bytes,
+            game_id,
+            stats.seconds,
+        )
 
-    def launch_game_by_id(self, game_id: str):
-        game = self._get_game_by_id(game_id)
+    async def launch_game_by_id(self, game_id: str) -> asyncio.subprocess.Process:
+        """Starts the emulator for a game and returns once it has spawned.
 
+        With a `launch_prefetcher`, the game's files are prefetched while the
+        emulator starts.
+        """
+        loop = asyncio.get_running_loop()
+        game = await loop.run_in_executor(
+            self._scan_executor, self.get_game_by_id, game_id
+        )
         game_eboot_bin = game.find_eboot_file()
-        self._run_with_arguments([game_eboot_bin])
+
+        started_at = time.perf_counter()
+        if self.launch_prefetcher is not None:
+            prefetch = asyncio.ensure_future(
+                self.launch_prefetcher.prefetch(game_eboot_bin)
+            )
+            prefetch.add_done_callback(
+                functools.partial(self._on_prefetch_done, game_id)
+            )
+
+        process = await self._start_with_arguments([game_eboot_bin])
+        logger.info(
+            "Spawned RPCS3 for %s in %.3fs", game_id, time.perf_counter() - started_at
+        )
+
+        return process
 
 
 class GameNotFoundError(Exception):
     pass
 
 
+class StorageUnreachableError(TimeoutError):
+    """Raised for games whose storage didn't respond and whose metadata isn't
+    known from earlier scans."""
+
+
 class RPCS3Game:
-    def __init__(self, id: str, directory: str):
-        self.id = id
+    __slots__ = (
+        "id",
+        "directory",
+        "metadata_index",
+        "updates",
+        "additional_content",
+        "_cached_sfo",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        directory: str,
+        metadata_index: Optional[SfoMetadataIndex] = None,
+    ):
+        self.id = sys.intern(id)
         self.directory = directory
+        self.metadata_index = metadata_index
 
-        self._cached_sfo = None
+        # Patches and DLC installed to dev_hdd0/game. Shared empty tuples are
+        # kept for the majority of games that have neither.
+        self.updates: Tuple[RPCS3HddGame, ...] = ()
+        self.additional_content: Tuple[RPCS3HddGame, ...] = ()
 
-    @staticmethod
-    def from_yaml_line(line: str):
-        line_parts = [part.strip() for part in line.split(": ")]
+        self._cached_sfo: Optional[CompactSfo] = None
 
-        return RPCS3Game(line_parts[0], line_parts[1])
+    @property
+    def sfo_file(self) -> str:
+        return path.join(self.directory, "PS3_GAME", "PARAM.SFO")
+
+    @property
+    def content_directories(self) -> List[str]:
+        """The directories of the game and its patches and DLC."""
+        return [self.directory] + [
+            content.directory for content in self.updates + self.additional_content
+        ]
+
+    @property
+    def trophy_directory(self) -> str:
+        return path.join(self.directory, "PS3_GAME", "TROPDIR")
+
+    def find_trophy_sets(self) -> List[str]:
+        """Returns the NP communication IDs of the game's trophy sets, which
+        name its trophy directories in the users' homes."""
+        try:
+            with os.scandir(self.trophy_directory) as entries:
+                return [entry.name for entry in entries if entry.is_dir()]
+        except OSError:
+            return []
+
+    def _decode_sfo(self, sfo_file: str, stat: os.stat_result) -> CompactSfo:
+        if self.metadata_index is not None:
+            return self.metadata_index.lookup(sfo_file, stat).to_sfo()
+
+        sfo = decode_sfo_file(sfo_file, keys=CompactSfo.KEYS)
+        return CompactSfo(sfo._mapping)
 
     @property
-    def _sfo(self):
+    def _sfo(self) -> Sfo:
         if self._cached_sfo is None:
-            sfo_file = path.join(self.directory, "PS3_GAME", "PARAM.SFO")
-            self._cached_sfo = decode_sfo_file(sfo_file)
+            self._cached_sfo = shared_sfo_cache.load(self.sfo_file, self._decode_sfo)
 
         return self._cached_sfo
 
+    @property
+    def has_metadata(self) -> bool:
+        return self._cached_sfo is not None
+
+    def restore_indexed_metadata(self):
+        """Takes the metadata last indexed for the SFO without reading it, for
+        games whose storage is missing or unreachable."""
+        if self.metadata_index is None:
+            return
+
+        metadata = self.metadata_index.last_indexed(self.sfo_file)
+        if metadata is not None:
+            self._cached_sfo = metadata.to_sfo()
+
+    def load_metadata(self, stat: Optional[os.stat_result] = None):
+        """Reads the SFO eagerly so that later property accesses don't block.
+
+        The SFO is revalidated against the shared cache, so changes since the
+        last call are picked up. `stat` may be passed if the caller has already
+        stat'ed the SFO. Raises if the SFO or its title can't be read.
+        """
+        self._cached_sfo = shared_sfo_cache.load(self.sfo_file, self._decode_sfo, stat)
+        self.title
+
     @property
     def title(self) -> str:
         return self._sfo.title
 
+    @property
+    def title_id(self) -> str:
+        return self._sfo.title_id
+
+    @property
+    def category(self) -> str:
+        return self._sfo.category
+
+    @property
+    def app_version(self) -> str:
+        return self._sfo.app_version
+
     @property
     def _default_eboot_bin_path(self) -> str:
         return path.join(self.directory, "PS3_GAME", "USRDIR", "EBOOT.BIN")
@@ -80,3 +712,28 @@ class RPCS3Game:
     def find_eboot_file(self) -> str:
         # There might be alternative paths?
         return self._default_eboot_bin_path
+
+
+class RPCS3HddGame(RPCS3Game):
+    """Content installed to dev_hdd0/game, such as PSN games, patches or DLC."""
+
+    __slots__ = ()
+
+    @property
+    def sfo_file(self) -> str:
+        return path.join(self.directory, "PARAM.SFO")
+
+    @property
+    def trophy_directory(self) -> str:
+        return path.join(self.directory, "TROPDIR")
+
+    @property
+    def _default_eboot_bin_path(self) -> str:
+        return path.join(self.directory, "USRDIR", "EBOOT.BIN")
+
+    def load_metadata(self, stat: Optional[os.stat_result] = None):
+        super().load_metadata(stat)
+
+        # Required to classify the content and attach it to its base game
+        self.category
+        self.title_id
@@ -1,9 +1,13 @@
+import struct
+import sys
 from enum import Enum
 from io import BufferedReader
-from typing import Dict, List, Tuple, Union
+from typing import Collection, Dict, List, Optional, Tuple, Union
 
 
 class Sfo:
+    __slots__ = ("_mapping",)
+
     def __init__(self, mapping: Dict[str, Union[str, int]]):
         self._mapping = mapping
 
@@ -33,6 +37,40 @@ class Sfo:
         return self.get_string("APP_VER")
 
 
+class CompactSfo(Sfo):
+    """Sfo that keeps only the entries the plugin reads, stored in slots.
+
+    Frequently repeated values such as categories and versions are interned.
+    """
+
+    # Maps the kept SFO keys to their slots
+    KEY_SLOTS = {
+        "TITLE": "_title",
+        "TITLE_ID": "_title_id",
+        "CATEGORY": "_category",
+        "APP_VER": "_app_version",
+    }
+    KEYS = frozenset(KEY_SLOTS)
+    INTERNED_KEYS = frozenset(["CATEGORY", "APP_VER"])
+
+    __slots__ = tuple(KEY_SLOTS.values())
+
+    def __init__(self, mapping: Dict[str, Union[str, int]]):
+        for key, slot in CompactSfo.KEY_SLOTS.items():
+            value = mapping.get(key)
+            if key in CompactSfo.INTERNED_KEYS and isinstance(value, str):
+                value = sys.intern(value)
+
+            setattr(self, slot, value)
+
+    def __getitem__(self, key):
+        value = getattr(self, CompactSfo.KEY_SLOTS[key])
+        if value is None:
+            raise KeyError(key)
+
+        return value
+
+
 class SfoDecoder:
     DEFAULT_BYTE_ORDER = "little"
 
@@ -103,7 +141,7 @@ class SfoDecoder:
 
     def _extract_key(self, position: int) -> str:
         self._seek(position)
-        return self._read_string_null_terminated()
+        return sys.intern(self._read_string_null_terminated())
 
     def _extract_data(self, position: int, length: int, format: int) -> Union[str, int]:
         if length == 0:
@@ -142,6 +180,13 @@ class SfoDecoder:
         return Sfo(mapping)
 
 
+class SfoCategories:
+    DISC_GAME = "DG"
+    HDD_GAME = "HG"
+    GAME_DATA = "GD"
+    ADDITIONAL_CONTENT = "AC"
+
+
 class SfoEntryFormats:
     UTF8_SPECIAL = 0x0004
     UTF8 = 0x0204
@@ -164,9 +209,136 @@ class SfoEntry:
         self.data_offset = data_offset
 
 
-def decode_sfo_file(path: str):
-    decoder = SfoDecoder()
+class SfoBufferDecoder:
+    """Decodes an SFO that has been read into memory as a whole.
+
+    Produces the same mapping as `SfoDecoder`, but parses the tables with
+    precompiled `struct` formats instead of issuing a read per field.
+    """
+
+    HEADER = struct.Struct("<IIIII")
+    INDEX_ENTRY = struct.Struct("<HHIII")
+    UINT32 = struct.Struct("<I")
+
+    def _read_string_null_terminated(self, data: bytes, position: int) -> str:
+        end = data.find(b"\0", position)
+        if end == -1:
+            end = len(data)
+
+        return str(data[position:end], encoding="utf-8")
+
+    def _extract_data(
+        self, data: bytes, position: int, length: int, format: int
+    ) -> Union[str, int]:
+        if length == 0:
+            # Reserved entry
+            return -1
+
+        if format == SfoEntryFormats.UTF8_SPECIAL:
+            return str(data[position : position + length], encoding="utf-8")
+        elif format == SfoEntryFormats.UTF8:
+            return self._read_string_null_terminated(data, position)
+        elif format == SfoEntryFormats.UNSIGNED_INT:
+            if length == SfoBufferDecoder.UINT32.size:
+                return SfoBufferDecoder.UINT32.unpack_from(data, position)[0]
+
+            return int.from_bytes(
+                data[position : position + length],
+                byteorder=SfoDecoder.DEFAULT_BYTE_ORDER,
+                signed=False,
+            )
+
+        raise KeyError("Unknown data format " + hex(format))
+
+    def read_header(self, data: bytes):
+        (
+            _magic,
+            _version,
+            self.key_table_start,
+            self.data_table_start,
+            self.tables_entries,
+        ) = SfoBufferDecoder.HEADER.unpack_from(data, 0)
+
+    def read_index_table(self, data: bytes) -> List["SfoEntry"]:
+        self.read_header(data)
+
+        entry_size = SfoBufferDecoder.INDEX_ENTRY.size
+        index_table_start = SfoBufferDecoder.HEADER.size
+
+        return [
+            SfoEntry(*SfoBufferDecoder.INDEX_ENTRY.unpack_from(data, position))
+            for position in range(
+                index_table_start, self.key_table_start - entry_size + 1, entry_size
+            )
+        ]
+
+    def decode(self, data: bytes) -> Sfo:
+        entries = self.read_index_table(data)
+
+        mapping = {}
+        for entry in entries:
+            key = sys.intern(
+                self._read_string_null_terminated(
+                    data, self.key_table_start + entry.key_offset
+                )
+            )
+            mapping[key] = self._extract_data(
+                data,
+                self.data_table_start + entry.data_offset,
+                entry.data_len,
+                entry.data_fmt,
+            )
 
+        return Sfo(mapping)
+
+    def decode_selected(self, reader: BufferedReader, keys: Collection[str]) -> Sfo:
+        """Reads only the tables and values needed to resolve `keys`.
+
+        The header, index table and key table are fetched in two reads, after
+        which each requested value costs one seek and a read of its own length.
+        Keys missing from the SFO are left out of the mapping.
+        """
+        data = reader.read(SfoBufferDecoder.HEADER.size)
+        self.read_header(data)
+        data += reader.read(self.data_table_start - len(data))
+
+        entries = self.read_index_table(data)
+        remaining = set(keys)
+
+        mapping = {}
+        for entry in entries:
+            key = sys.intern(
+                self._read_string_null_terminated(
+                    data, self.key_table_start + entry.key_offset
+                )
+            )
+            if key not in remaining:
+                continue
+
+            reader.seek(self.data_table_start + entry.data_offset)
+            value = reader.read(entry.data_len)
+            mapping[key] = self._extract_data(value, 0, entry.data_len, entry.data_fmt)
+
+            remaining.discard(key)
+            if not remaining:
+                break
+
+        return Sfo(mapping)
+
+
+def decode_sfo_bytes(data: bytes) -> Sfo:
+    return SfoBufferDecoder().decode(data)
+
+
+def decode_sfo_file(
+    path: str, keys: Optional[Collection[str]] = None, streaming=False
+) -> Sfo:
     # Open in binary reading mode
     with open(path, mode="rb") as file:
-        return decoder.decode(file)
+        if keys is not None:
+            return SfoBufferDecoder().decode_selected(file, keys)
+
+        if streaming:
+            return SfoDecoder().decode(file)
+
+        return decode_sfo_bytes(file.read())
@@ -0,0 +1,115 @@
+import os
+import sys
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Optional, Tuple
+
+from .file_stamps import FileStamp, file_stamp
+from .sfo import CompactSfo
+
+
+class SfoCache:
+    """Least-recently-used cache of decoded SFOs, shared across games.
+
+    Entries are keyed by path and only returned while the file's
+    `(mtime_ns, size)` is unchanged. The cache is bounded by both entry count
+    and an approximation of the memory held by its entries.
+    """
+
+    DEFAULT_MAX_ENTRIES = 8192
+    DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+    def __init__(
+        self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+
+        # Maps paths to (stamp, sfo, approximate size), least recently used first
+        self._entries: "OrderedDict[str, Tuple[FileStamp, CompactSfo, int]]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def approximate_bytes(self) -> int:
+        return self._bytes
+
+    @staticmethod
+    def _approximate_size(path: str, sfo: CompactSfo) -> int:
+        size = sys.getsizeof(path) + sys.getsizeof(sfo)
+        for key in CompactSfo.KEYS:
+            try:
+                size += sys.getsizeof(sfo[key])
+            except KeyError:
+                pass
+
+        return size
+
+    def _remove(self, path: str):
+        _stamp, _sfo, size = self._entries.pop(path)
+        self._bytes -= size
+
+    def get(self, path: str, stamp: FileStamp) -> Optional[CompactSfo]:
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != stamp:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, path: str, stamp: FileStamp, sfo: CompactSfo):
+        size = SfoCache._approximate_size(path, sfo)
+
+        with self._lock:
+            if path in self._entries:
+                self._remove(path)
+
+            self._entries[path] = (stamp, sfo, size)
+            self._bytes += size
+
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def load(
+        self,
+        path: str,
+        decode: Callable[[str, os.stat_result], CompactSfo],
+        stat: Optional[os.stat_result] = None,
+    ) -> CompactSfo:
+        """Returns the cached SFO at `path`, calling `decode` with the path and
+        its stat result if it isn't cached or has changed.
+
+        `stat` may be passed if the caller has already stat'ed the file.
+        """
+        if stat is None:
+            stat = os.stat(path)
+        stamp = file_stamp(stat)
+
+        sfo = self.get(path, stamp)
+        if sfo is None:
+            sfo = decode(path, stat)
+            self.put(path, stamp, sfo)
+
+        return sfo
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+# Shared by all games of the plugin process
+shared_sfo_cache = SfoCache()
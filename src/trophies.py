@@ -0,0 +1,157 @@
+import mmap
+import os
+import struct
+from threading import Lock
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .file_stamps import FileStamp, file_stamp
+
+# Microseconds between 0001-01-01, where PS3 ticks start, and the unix epoch
+TICKS_BEFORE_UNIX_EPOCH = 62135596800 * 1000000
+
+
+class UnlockedTrophy(NamedTuple):
+    trophy_id: int
+    # Unix timestamp
+    unlock_time: int
+    # From the trophy set's TROPCONF.SFM, if known
+    name: Optional[str] = None
+
+
+def tick_to_timestamp(tick: int) -> int:
+    """Converts the microsecond ticks of a trophy unlock to a unix timestamp.
+
+    Ticks count from 0001-01-01 like CellRtcTick. Smaller values can't be
+    recent dates that way, so they are read as microseconds since the epoch.
+    """
+    if tick >= TICKS_BEFORE_UNIX_EPOCH:
+        tick -= TICKS_BEFORE_UNIX_EPOCH
+
+    return tick // 1000000
+
+
+class TropusrDecoder:
+    """Decodes the unlock table of a TROPUSR.DAT, RPCS3's per-user trophy
+    progress file.
+
+    The file is a header followed by table headers, each pointing to a table of
+    fixed-size records. Type 6 tables hold one record per trophy with its
+    unlock state and time, which are unpacked in bulk.
+    """
+
+    MAGIC = 0x818F54AD
+    UNLOCK_TABLE_TYPE = 6
+
+    HEADER = struct.Struct(">IIII32x")
+    TABLE_HEADER = struct.Struct(">IIIIQQ")
+    # Entry type, size, ID and padding, then trophy ID, state, two unknown
+    # fields and the unlock time twice
+    UNLOCK_ENTRY = struct.Struct(">IIII IIII QQ 64x")
+    ENTRY_HEADER_SIZE = 16
+
+    def decode(self, data) -> List[UnlockedTrophy]:
+        """Returns the unlocked trophies of the TROPUSR.DAT in `data`, which
+        may be any buffer such as an mmap."""
+        if len(data) < TropusrDecoder.HEADER.size:
+            raise ValueError("TROPUSR.DAT is truncated")
+
+        magic, _unknown, tables_count, _unknown = TropusrDecoder.HEADER.unpack_from(
+            data, 0
+        )
+        if magic != TropusrDecoder.MAGIC:
+            raise ValueError("Not a TROPUSR.DAT, magic " + hex(magic))
+
+        unlocked = []
+        for table in range(tables_count):
+            position = (
+                TropusrDecoder.HEADER.size + table * TropusrDecoder.TABLE_HEADER.size
+            )
+            (
+                table_type,
+                entries_size,
+                _unknown,
+                entries_count,
+                offset,
+                _reserved,
+            ) = TropusrDecoder.TABLE_HEADER.unpack_from(data, position)
+
+            if table_type == TropusrDecoder.UNLOCK_TABLE_TYPE:
+                unlocked.extend(
+                    self._decode_unlock_table(data, entries_size, entries_count, offset)
+                )
+
+        return unlocked
+
+    def _decode_unlock_table(
+        self, data, entries_size: int, entries_count: int, offset: int
+    ) -> List[UnlockedTrophy]:
+        entry_size = TropusrDecoder.ENTRY_HEADER_SIZE + entries_size
+        if entry_size != TropusrDecoder.UNLOCK_ENTRY.size:
+            raise ValueError(f"Unexpected unlock entry size {entry_size}")
+
+        end = offset + entries_count * entry_size
+        if end > len(data):
+            raise ValueError("TROPUSR.DAT unlock table is truncated")
+
+        with memoryview(data) as view:
+            return [
+                UnlockedTrophy(trophy_id, tick_to_timestamp(unlock_tick))
+                for (
+                    _entry_type,
+                    _entry_size,
+                    _entry_id,
+                    _padding,
+                    trophy_id,
+                    state,
+                    _unknown,
+                    _unknown,
+                    unlock_tick,
+                    _unlock_tick,
+                ) in TropusrDecoder.UNLOCK_ENTRY.iter_unpack(view[offset:end])
+                if state
+            ]
+
+
+def read_tropusr_file(file_path: str) -> List[UnlockedTrophy]:
+    with open(file_path, "rb") as tropusr_file:
+        if os.fstat(tropusr_file.fileno()).st_size == 0:
+            raise ValueError("TROPUSR.DAT is empty")
+
+        with mmap.mmap(tropusr_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return TropusrDecoder().decode(data)
+
+
+class TrophyCache:
+    """Unlocked trophies by TROPUSR.DAT path.
+
+    Files are only decoded again once their `(mtime_ns, size)` changes.
+    """
+
+    def __init__(self):
+        # Maps paths to (stamp, unlocked trophies)
+        self._entries: Dict[str, Tuple[FileStamp, List[UnlockedTrophy]]] = {}
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def load(self, file_path: str) -> Optional[List[UnlockedTrophy]]:
+        """Returns None if there is no file at `file_path`."""
+        try:
+            stamp = file_stamp(os.stat(file_path))
+        except FileNotFoundError:
+            with self._lock:
+                self._entries.pop(file_path, None)
+            return None
+
+        with self._lock:
+            entry = self._entries.get(file_path)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+
+        unlocked = read_tropusr_file(file_path)
+
+        with self._lock:
+            self._entries[file_path] = (stamp, unlocked)
+
+        return unlocked
@@ -0,0 +1,113 @@
+import os
+import xml.etree.ElementTree as ElementTree
+from typing import Dict, Optional
+
+from .file_stamps import StampedDatabase, file_stamp
+
+# Bytes searched for the start of the XML, which some files prefix with a header
+XML_START_SEARCH_SIZE = 1024
+
+
+def read_trophy_names(path: str) -> Dict[int, str]:
+    """Reads the trophy names from a TROPCONF.SFM, the XML configuration of a
+    trophy set.
+
+    The file is parsed as a stream and every `<trophy>` element is dropped
+    once read, so memory use doesn't grow with the size of the set.
+    """
+    names = {}
+
+    with open(path, "rb") as file:
+        start = file.read(XML_START_SEARCH_SIZE).find(b"<")
+        if start == -1:
+            raise ValueError(f"{path} contains no XML")
+        file.seek(start)
+
+        root = None
+        for event, element in ElementTree.iterparse(file, events=("start", "end")):
+            if root is None:
+                root = element
+                continue
+
+            if event != "end" or element.tag != "trophy":
+                continue
+
+            name = element.findtext("name")
+            try:
+                trophy_id = int(element.get("id", ""))
+            except ValueError:
+                trophy_id = None
+
+            if trophy_id is not None and name:
+                names[trophy_id] = name
+
+            root.clear()
+
+    return names
+
+
+class TrophyCatalog(StampedDatabase):
+    """Persistent catalog of trophy names by TROPCONF.SFM path.
+
+    Like `SfoMetadataIndex`, entries are validated against the file's
+    `(st_mtime_ns, st_size)`, so a trophy configuration is only parsed again
+    once it changes.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS trophy_sets (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS trophy_names (
+            path TEXT NOT NULL,
+            trophy_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            PRIMARY KEY (path, trophy_id)
+        );
+    """
+
+    def _cached_names(
+        self, path: str, stat: os.stat_result
+    ) -> Optional[Dict[int, str]]:
+        with self._lock:
+            stamp = self._connection.execute(
+                "SELECT mtime_ns, size FROM trophy_sets WHERE path = ?", (path,)
+            ).fetchone()
+            if stamp != file_stamp(stat):
+                return None
+
+            rows = self._connection.execute(
+                "SELECT trophy_id, name FROM trophy_names WHERE path = ?", (path,)
+            ).fetchall()
+
+        return dict(rows)
+
+    def _store(self, path: str, stat: os.stat_result, names: Dict[int, str]):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM trophy_names WHERE path = ?", (path,))
+            self._connection.executemany(
+                "INSERT INTO trophy_names (path, trophy_id, name) VALUES (?, ?, ?)",
+                [(path, trophy_id, name) for trophy_id, name in names.items()],
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO trophy_sets (path, mtime_ns, size) "
+                "VALUES (?, ?, ?)",
+                (path, *file_stamp(stat)),
+            )
+
+    def lookup(
+        self, path: str, stat: Optional[os.stat_result] = None
+    ) -> Dict[int, str]:
+        """Returns the names of the trophies configured at `path` by trophy ID,
+        parsing the file if it isn't cataloged or has changed."""
+        if stat is None:
+            stat = os.stat(path)
+
+        names = self._cached_names(path, stat)
+        if names is None:
+            names = read_trophy_names(path)
+            self._store(path, stat, names)
+
+        return names
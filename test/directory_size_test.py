@@ -0,0 +1,67 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from src.directory_size import DirectorySizeCalculator
+
+
+class TestDirectorySizeCalculator(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.calculator = DirectorySizeCalculator()
+
+        os.makedirs(os.path.join(self.directory, "PS3_GAME", "USRDIR"))
+        self._write("PS3_GAME/USRDIR/EBOOT.BIN", 64 * 1024)
+        self._write("PS3_GAME/PARAM.SFO", 1024)
+
+    def tearDown(self):
+        self.calculator.close()
+        shutil.rmtree(self.directory)
+
+    def _write(self, relative_path: str, size: int) -> str:
+        file_path = os.path.join(self.directory, relative_path)
+        with open(file_path, "wb") as file:
+            file.write(os.urandom(size))
+
+        return file_path
+
+    def _size(self) -> int:
+        return asyncio.run(self.calculator.size_of([self.directory]))
+
+    def test_hardlinks_are_counted_once(self):
+        size = self._size()
+        self.assertGreaterEqual(size, 65 * 1024)
+
+        os.link(
+            os.path.join(self.directory, "PS3_GAME", "USRDIR", "EBOOT.BIN"),
+            os.path.join(self.directory, "PS3_GAME", "EBOOT.LINK"),
+        )
+        self.assertEqual(self._size(), size)
+
+    def test_unchanged_directories_are_not_listed_again(self):
+        size = self._size()
+
+        with mock.patch("src.directory_size.os.scandir") as scandir:
+            self.assertEqual(self._size(), size)
+            scandir.assert_not_called()
+
+        self._write("PS3_GAME/USRDIR/DATA.PSARC", 32 * 1024)
+        self.assertGreaterEqual(self._size(), size + 32 * 1024)
+
+    def test_cache_is_bounded(self):
+        self.calculator.max_cached_files = 1
+        size = self._size()
+
+        # Older directories are evicted once the files exceed the bound
+        self.assertEqual(
+            list(self.calculator._cache),
+            [os.path.join(self.directory, "PS3_GAME", "USRDIR")],
+        )
+        self.assertEqual(self._size(), size)
+
+
+if __name__ == "__main__":
+    unittest.main()
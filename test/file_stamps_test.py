@@ -0,0 +1,46 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.file_stamps import StampedDatabase, read_file_stamp
+
+
+class NamesDatabase(StampedDatabase):
+    SCHEMA = "CREATE TABLE IF NOT EXISTS names (name TEXT PRIMARY KEY);"
+
+
+class TestFileStamps(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_read_file_stamp(self):
+        file_path = os.path.join(self.directory, "games.yml")
+        self.assertIsNone(read_file_stamp(file_path))
+
+        with open(file_path, "w") as file:
+            file.write("BLUS30001: /games/plain/\n")
+        stat = os.stat(file_path)
+
+        self.assertEqual(read_file_stamp(file_path), (stat.st_mtime_ns, 25))
+
+    def test_database_applies_schema_once_per_open(self):
+        database_path = os.path.join(self.directory, "names.sqlite3")
+
+        database = NamesDatabase(database_path)
+        with database._connection:
+            database._connection.execute("INSERT INTO names VALUES ('RPCS3')")
+        database.close()
+
+        database = NamesDatabase(database_path)
+        rows = database._connection.execute("SELECT name FROM names").fetchall()
+        database.close()
+
+        self.assertEqual(rows, [("RPCS3",)])
+
+
+if __name__ == "__main__":
+    unittest.main()
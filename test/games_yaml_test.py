@@ -0,0 +1,46 @@
+import unittest
+
+from src.games_yaml import GamesYamlParser
+
+
+class TestGamesYamlParser(unittest.TestCase):
+    def test_parses_scalars_and_comments(self):
+        parser = GamesYamlParser()
+        lines = [
+            "# Games registered in RPCS3\n",
+            "---\n",
+            "BLUS30001: /games/plain/\n",
+            "BLES00002: /games/with comment/  # moved\n",
+            'BCES00003: "C:/Games/Title: Subtitle/"\r\n',
+            "NPEB00004: 'D:/It''s a game/'\n",
+            '"NPUB00005": "E:/tab\\there/\\u00e9"\n',
+            "\n",
+        ]
+
+        self.assertEqual(
+            list(parser.parse(lines)),
+            [
+                ("BLUS30001", "/games/plain/"),
+                ("BLES00002", "/games/with comment/"),
+                ("BCES00003", "C:/Games/Title: Subtitle/"),
+                ("NPEB00004", "D:/It's a game/"),
+                ("NPUB00005", "E:/tab\there/é"),
+            ],
+        )
+        self.assertEqual(parser.errors, [])
+
+    def test_reports_malformed_lines(self):
+        parser = GamesYamlParser()
+        lines = [
+            "BLUS30001 /games/missing-separator/\n",
+            'BLUS30002: "unterminated\n',
+            "BLUS30003:\n",
+            "BLUS30004: /games/valid/\n",
+        ]
+
+        self.assertEqual(list(parser.parse(lines)), [("BLUS30004", "/games/valid/")])
+        self.assertEqual([error.line_number for error in parser.errors], [1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
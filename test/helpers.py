@@ -0,0 +1,109 @@
+"""Builders of RPCS3 files and file helpers shared by the tests."""
+
+import os
+import shutil
+import struct
+
+from src.trophies import TICKS_BEFORE_UNIX_EPOCH, TropusrDecoder
+
+TROPCONF = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<!--This file was automatically generated by Exdata Builder.-->
+<trophyconf version="1.0" policy="large">
+<npcommid>NPWR00001_00</npcommid>
+<title-name>WipEout HD</title-name>
+<trophy id="000" hidden="no" ttype="P" pid="000"><name>Platinum</name><detail>All of them</detail></trophy>
+<trophy id="001" hidden="yes" ttype="B" pid="000"><name>Zone &amp; Beyond</name></trophy>
+<trophy id="002" hidden="no" ttype="B" pid="000"><detail>Unnamed</detail></trophy>
+</trophyconf>
+"""
+
+
+def touch_newer(path: str):
+    """Advances the mtime of a rewritten file, whose stamp could otherwise stay
+    the same on file systems with coarse timestamps."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+
+def write_tropconf(path: str, content: str = TROPCONF, header: bytes = b""):
+    with open(path, "wb") as file:
+        file.write(header + content.encode("utf-8"))
+
+
+def build_tropusr(states: dict) -> bytes:
+    """Encodes a TROPUSR.DAT whose unlock table holds `states`, which maps
+    trophy IDs to unlock times or None for locked trophies."""
+    header = struct.pack(">IIII32x", TropusrDecoder.MAGIC, 0, 2, 0)
+    table_offset = len(header) + 2 * 32
+
+    # An empty type 4 table precedes the unlock table
+    tables = struct.pack(">IIIIQQ", 4, 0x50, 1, 0, table_offset, 0)
+    tables += struct.pack(">IIIIQQ", 6, 0x60, 1, len(states), table_offset, 0)
+
+    entries = b""
+    for entry_id, (trophy_id, unlock_time) in enumerate(sorted(states.items())):
+        tick = 0
+        if unlock_time is not None:
+            tick = unlock_time * 1000000 + TICKS_BEFORE_UNIX_EPOCH
+
+        entries += struct.pack(
+            ">IIII IIII QQ 64x",
+            6,
+            0x60,
+            entry_id,
+            0,
+            trophy_id,
+            unlock_time is not None,
+            0,
+            0,
+            tick,
+            tick,
+        )
+
+    return header + tables + entries
+
+
+def build_sfo(mapping: dict) -> bytes:
+    """Encodes string entries into a minimal PARAM.SFO."""
+    keys = b""
+    values = b""
+    index = b""
+
+    for key, value in sorted(mapping.items()):
+        encoded = value.encode("utf-8") + b"\0"
+        max_length = (len(encoded) + 3) // 4 * 4
+
+        index += struct.pack(
+            "<HHIII", len(keys), 0x0204, len(encoded), max_length, len(values)
+        )
+        keys += key.encode("utf-8") + b"\0"
+        values += encoded.ljust(max_length, b"\0")
+
+    keys = keys.ljust((len(keys) + 3) // 4 * 4, b"\0")
+    key_table_start = 20 + len(index)
+    data_table_start = key_table_start + len(keys)
+    header = struct.pack(
+        "<4sIIII", b"\0PSF", 0x0101, key_table_start, data_table_start, len(mapping)
+    )
+
+    return header + index + keys + values
+
+
+def create_hdd0_content(config_directory: str, directory_name: str, **sfo) -> str:
+    directory = os.path.join(config_directory, "dev_hdd0", "game", directory_name)
+    os.makedirs(os.path.join(directory, "USRDIR"))
+
+    with open(os.path.join(directory, "PARAM.SFO"), "wb") as file:
+        file.write(build_sfo(sfo))
+
+    return directory
+
+
+def create_game(games_directory: str, game_id: str, sfo_file=None) -> str:
+    directory = os.path.join(games_directory, game_id)
+    os.makedirs(os.path.join(directory, "PS3_GAME", "USRDIR"))
+
+    if sfo_file is not None:
+        shutil.copyfile(sfo_file, os.path.join(directory, "PS3_GAME", "PARAM.SFO"))
+
+    return directory
@@ -0,0 +1,84 @@
+import asyncio
+import ntpath
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from src.install_state import InstallStateChecker, read_mount_points, storage_root
+
+
+def fake_isfile(file_path: str) -> bool:
+    if file_path.startswith("/mnt/dead"):
+        time.sleep(0.5)
+    return file_path.endswith("EBOOT.BIN")
+
+
+class TestInstallStateChecker(unittest.TestCase):
+    def test_storage_root(self):
+        mount_points = ["/", "/mnt/nas/ps3", "/mnt/nas/ps3/games"]
+
+        self.assertEqual(
+            storage_root("/mnt/nas/ps3/game/EBOOT.BIN", mount_points), "/mnt/nas/ps3"
+        )
+        self.assertEqual(
+            storage_root("/mnt/nas/ps3/games/EBOOT.BIN", mount_points),
+            "/mnt/nas/ps3/games",
+        )
+        self.assertEqual(storage_root("/mnt/nas/ps3x/EBOOT.BIN", mount_points), "/")
+        # Without a mount table
+        self.assertEqual(storage_root("/Volumes/NAS/ps3/EBOOT.BIN"), "/Volumes/NAS")
+
+    @mock.patch("src.install_state.path", ntpath)
+    def test_windows_storage_root(self):
+        self.assertEqual(storage_root("D:\\Games\\BLUS30001\\EBOOT.BIN"), "d:")
+        self.assertEqual(
+            storage_root("\\\\NAS\\PS3\\BLUS30001\\EBOOT.BIN"), "\\\\nas\\ps3"
+        )
+        self.assertEqual(storage_root("//nas/ps3/BLUS30001/EBOOT.BIN"), "\\\\nas\\ps3")
+
+    def test_read_mount_points(self):
+        with tempfile.NamedTemporaryFile("w", delete=False) as file:
+            file.write("/dev/sda1 / ext4 rw 0 0\n")
+            file.write("//nas/ps3 /mnt/my\\040nas cifs rw 0 0\n")
+        try:
+            self.assertEqual(read_mount_points(file.name), ["/", "/mnt/my nas"])
+        finally:
+            os.remove(file.name)
+
+        self.assertEqual(read_mount_points(file.name), [])
+
+    @mock.patch("src.install_state.read_mount_points", return_value=["/", "/mnt/dead"])
+    @mock.patch("src.install_state.path.isfile", side_effect=fake_isfile)
+    def test_dead_storage_costs_one_timeout(self, isfile, _read_mount_points):
+        checker = InstallStateChecker(timeout=0.1)
+        paths = [
+            "/home/user/a/EBOOT.BIN",
+            "/home/user/b/MISSING.BIN",
+            "/mnt/dead/c/EBOOT.BIN",
+            "/mnt/dead/d/EBOOT.BIN",
+        ]
+
+        started = time.monotonic()
+        results = asyncio.run(checker.check(paths))
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(results, dict(zip(paths, [True, False, None, None])))
+        self.assertLess(elapsed, 0.4)
+        # Only one path on the dead share was stat'ed
+        self.assertEqual(
+            [call.args[0] for call in isfile.call_args_list].count(
+                "/mnt/dead/d/EBOOT.BIN"
+            ),
+            0,
+        )
+
+        # Results are cached
+        asyncio.run(checker.check(paths))
+        self.assertEqual(isfile.call_count, 3)
+        checker.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
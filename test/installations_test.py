@@ -0,0 +1,147 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.installations import RPCS3Installations
+from src.playtime import GamePlaytime
+from src.rpcs3 import RPCS3, GameNotFoundError
+from src.trophies import UnlockedTrophy
+from test.helpers import build_tropusr, create_game, write_tropconf
+
+
+def create_installation(config_directory: str, games: dict) -> RPCS3:
+    """Creates a library of the given games, which maps game IDs to whether
+    their EBOOT.BIN exists."""
+    games_directory = os.path.join(config_directory, "games")
+
+    with open(os.path.join(config_directory, "games.yml"), "w") as file:
+        for game_id, installed in games.items():
+            directory = create_game(games_directory, game_id, "test/wipeout.sfo")
+            file.write(f"{game_id}: {directory}/\n")
+
+            if installed:
+                eboot_file = os.path.join(directory, "PS3_GAME", "USRDIR", "EBOOT.BIN")
+                open(eboot_file, "wb").close()
+
+    return RPCS3("rpcs3", config_directory)
+
+
+def write_playtime(config_directory: str, content: str):
+    os.makedirs(os.path.join(config_directory, "GuiConfigs"))
+    settings_file = os.path.join(
+        config_directory, "GuiConfigs", "persistent_settings.dat"
+    )
+
+    with open(settings_file, "w") as file:
+        file.write(content)
+
+
+class TestRPCS3Installations(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.stable_directory = os.path.join(self.directory, "stable")
+        self.nightly_directory = os.path.join(self.directory, "nightly")
+        os.makedirs(self.stable_directory)
+        os.makedirs(self.nightly_directory)
+
+        self.stable = create_installation(
+            self.stable_directory, {"BCES00664": False, "BLUS00001": True}
+        )
+        self.nightly = create_installation(
+            self.nightly_directory,
+            {"BCES00664": True, "BLUS00001": True, "NPEB00002": False},
+        )
+        self.installations = RPCS3Installations([self.stable, self.nightly])
+
+    def tearDown(self):
+        self.installations.close()
+        shutil.rmtree(self.directory)
+
+    def test_games_are_deduplicated_by_preference(self):
+        scan = asyncio.run(self.installations.scan_games())
+
+        self.assertEqual(
+            sorted(game.id for game in scan.games),
+            ["BCES00664", "BLUS00001", "NPEB00002"],
+        )
+        self.assertEqual(
+            scan.installed,
+            {"BCES00664": True, "BLUS00001": True, "NPEB00002": False},
+        )
+        self.assertEqual(len(scan.stamps), 6)
+
+        # Installed copies win, then the configuration order decides
+        owners = {
+            game_id: asyncio.run(self.installations.owner_of(game_id))
+            for game_id in ["BCES00664", "BLUS00001", "NPEB00002"]
+        }
+        self.assertEqual(
+            owners,
+            {
+                "BCES00664": self.nightly,
+                "BLUS00001": self.stable,
+                "NPEB00002": self.nightly,
+            },
+        )
+
+    def test_unknown_games_are_not_routed(self):
+        with self.assertRaises(GameNotFoundError):
+            asyncio.run(self.installations.owner_of("MISSING"))
+
+    def test_playtime_is_summed(self):
+        write_playtime(
+            self.stable_directory,
+            "[Playtime]\nBCES00664=600000\n[LastPlayed]\nBCES00664=May 5 2021\n",
+        )
+        write_playtime(
+            self.nightly_directory,
+            "[Playtime]\nBCES00664=120000\nBLUS00001=60000\n"
+            "[LastPlayed]\nBCES00664=May 6 2021\n",
+        )
+
+        playtime = asyncio.run(self.installations.read_playtime())
+
+        nightly_playtime = asyncio.run(self.nightly.read_playtime())
+        self.assertEqual(
+            playtime,
+            {
+                "BCES00664": GamePlaytime(
+                    12, nightly_playtime["BCES00664"].last_played
+                ),
+                "BLUS00001": GamePlaytime(1, None),
+            },
+        )
+
+    def test_unlocked_trophies_are_routed_before_the_first_scan(self):
+        os.makedirs(
+            os.path.join(
+                self.nightly_directory,
+                "games",
+                "BCES00664",
+                "PS3_GAME",
+                "TROPDIR",
+                "NPWR00001_00",
+            )
+        )
+        trophy_directory = os.path.join(
+            self.nightly.hdd0_home_directory, "00000001", "trophy", "NPWR00001_00"
+        )
+        os.makedirs(trophy_directory)
+        with open(os.path.join(trophy_directory, "TROPUSR.DAT"), "wb") as file:
+            file.write(build_tropusr({0: 1600000000, 1: None}))
+        write_tropconf(os.path.join(trophy_directory, "TROPCONF.SFM"))
+
+        unlocked = asyncio.run(
+            self.installations.read_unlocked_trophies(["BCES00664", "MISSING"])
+        )
+
+        self.assertEqual(
+            unlocked,
+            {"BCES00664": [UnlockedTrophy(0, 1600000000, "Platinum")], "MISSING": []},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
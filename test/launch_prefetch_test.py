@@ -0,0 +1,48 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from src.launch_prefetch import LaunchPrefetcher
+
+
+class TestLaunchPrefetcher(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.eboot_file = os.path.join(self.directory, "EBOOT.BIN")
+
+        for name, size in [("EBOOT.BIN", 3000), ("b.sprx", 2000), ("a.sprx", 1000)]:
+            with open(os.path.join(self.directory, name), "wb") as file:
+                file.write(b"\0" * size)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_eboot_comes_before_hot_files(self):
+        prefetcher = LaunchPrefetcher()
+
+        self.assertEqual(
+            [os.path.basename(file) for file in prefetcher.files_for(self.eboot_file)],
+            ["EBOOT.BIN", "a.sprx", "b.sprx"],
+        )
+        prefetcher.close()
+
+    def test_budget_is_respected(self):
+        for use_fadvise in [False, True]:
+            if use_fadvise and not LaunchPrefetcher.USE_FADVISE:
+                continue
+
+            with self.subTest(use_fadvise=use_fadvise), mock.patch.object(
+                LaunchPrefetcher, "USE_FADVISE", use_fadvise
+            ):
+                prefetcher = LaunchPrefetcher(byte_budget=3500)
+                files = prefetcher.files_for(self.eboot_file)
+                stats = prefetcher.prefetch_files(files + ["missing.sprx"])
+
+                self.assertEqual((stats.files, stats.bytes), (2, 3500))
+                prefetcher.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
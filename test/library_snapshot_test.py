@@ -0,0 +1,82 @@
+import unittest
+
+from galaxy.api.consts import LocalGameState
+
+from src.library_snapshot import GameRecord, LibraryDiff, LibrarySnapshot
+
+INSTALLED = LocalGameState.Installed
+RUNNING = LocalGameState.Installed | LocalGameState.Running
+
+
+class RecordingPlugin:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda argument: self.calls.append((name, argument))
+
+
+class TestLibrarySnapshot(unittest.TestCase):
+    def test_round_trip_drops_running_state(self):
+        snapshot = LibrarySnapshot(
+            {
+                "BCES00664": GameRecord("WipEout® HD Fury", RUNNING),
+                "NPEB00001": GameRecord("PSN Game", INSTALLED),
+            },
+            ((1700000000000000000, 512), None),
+        )
+
+        restored = LibrarySnapshot.deserialize(snapshot.serialize())
+
+        self.assertEqual(
+            restored.games,
+            {
+                "BCES00664": GameRecord("WipEout® HD Fury", INSTALLED),
+                "NPEB00001": GameRecord("PSN Game", INSTALLED),
+            },
+        )
+        self.assertEqual(restored.stamps, snapshot.stamps)
+
+    def test_invalid_data(self):
+        self.assertIsNone(LibrarySnapshot.deserialize(None))
+        self.assertIsNone(LibrarySnapshot.deserialize("{"))
+        self.assertIsNone(LibrarySnapshot.deserialize('{"games": 1}'))
+
+
+class TestLibraryDiff(unittest.TestCase):
+    def test_minimal_changes(self):
+        older = {
+            "A": GameRecord("Unchanged", INSTALLED),
+            "B": GameRecord("Removed", INSTALLED),
+            "C": GameRecord("Old title", INSTALLED),
+            "D": GameRecord("Started", INSTALLED),
+        }
+        newer = {
+            "A": GameRecord("Unchanged", INSTALLED),
+            "C": GameRecord("New title", INSTALLED),
+            "D": GameRecord("Started", RUNNING),
+            "E": GameRecord("Added", INSTALLED),
+        }
+
+        diff = LibraryDiff.compute(older, newer)
+        plugin = RecordingPlugin()
+        diff.apply(plugin)
+
+        self.assertEqual(
+            [
+                (name, getattr(argument, "game_id", argument))
+                for name, argument in plugin.calls
+            ],
+            [
+                ("remove_game", "B"),
+                ("add_game", "E"),
+                ("update_local_game_status", "E"),
+                ("update_game", "C"),
+                ("update_local_game_status", "D"),
+            ],
+        )
+        self.assertFalse(LibraryDiff.compute(newer, dict(newer)))
+
+
+if __name__ == "__main__":
+    unittest.main()
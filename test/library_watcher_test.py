@@ -0,0 +1,127 @@
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from src.library_watcher import InotifyWatcher, PathWatcher, StatPollingWatcher
+
+
+class TestPathWatchers(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.games_file = os.path.join(self.directory, "games.yml")
+        self.game_directory = os.path.join(self.directory, "dev_hdd0", "game")
+        os.makedirs(self.game_directory)
+
+        with open(self.games_file, "w") as file:
+            file.write("BLUS30001: /games/plain/\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _assert_detects_changes(self, create_watcher):
+        async def run():
+            watcher = create_watcher([self.games_file, self.game_directory])
+            try:
+                # Unrelated files next to games.yml are ignored
+                with open(os.path.join(self.directory, "other.yml"), "w") as file:
+                    file.write("unrelated")
+                with self.assertRaises(asyncio.TimeoutError):
+                    await asyncio.wait_for(watcher.wait_for_change(), 0.2)
+
+                with open(self.games_file, "a") as file:
+                    file.write("BLUS30002: /games/other/\n")
+                await asyncio.wait_for(watcher.wait_for_change(), 1)
+
+                os.mkdir(os.path.join(self.game_directory, "NPEB00001"))
+                await asyncio.wait_for(watcher.wait_for_change(), 1)
+            finally:
+                watcher.close()
+
+        asyncio.run(run())
+
+    def _assert_detects_created_paths(self, create_watcher):
+        shutil.rmtree(os.path.join(self.directory, "dev_hdd0"))
+        os.remove(self.games_file)
+
+        async def run():
+            watcher = create_watcher([self.games_file, self.game_directory])
+            try:
+                os.mkdir(os.path.join(self.directory, "dev_hdd0"))
+                await asyncio.sleep(0.2)
+
+                os.mkdir(self.game_directory)
+                await asyncio.wait_for(watcher.wait_for_change(), 1)
+
+                os.mkdir(os.path.join(self.game_directory, "NPEB00001"))
+                await asyncio.wait_for(watcher.wait_for_change(), 1)
+
+                with open(self.games_file, "w") as file:
+                    file.write("BLUS30001: /games/plain/\n")
+                await asyncio.wait_for(watcher.wait_for_change(), 1)
+            finally:
+                watcher.close()
+
+        asyncio.run(run())
+
+    def _assert_detects_added_paths(self, create_watcher):
+        entry_directory = os.path.join(self.game_directory, "NPEB00001")
+        sfo_file = os.path.join(entry_directory, "PARAM.SFO")
+
+        async def run():
+            watcher = create_watcher([self.games_file, self.game_directory])
+            try:
+                os.mkdir(entry_directory)
+                await asyncio.wait_for(watcher.wait_for_change(), 1)
+
+                # The SFO of a PKG being installed is written after its
+                # directory was created, which doesn't change dev_hdd0/game
+                watcher.add_paths([sfo_file])
+                with open(sfo_file, "wb") as file:
+                    file.write(b"\0PSF")
+                await asyncio.wait_for(watcher.wait_for_change(), 1)
+
+                with open(sfo_file, "ab") as file:
+                    file.write(b"\0")
+                await asyncio.wait_for(watcher.wait_for_change(), 1)
+            finally:
+                watcher.close()
+
+        asyncio.run(run())
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_inotify_watcher(self):
+        self._assert_detects_changes(InotifyWatcher)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_inotify_watcher_waits_for_missing_paths(self):
+        self._assert_detects_created_paths(InotifyWatcher)
+
+    def test_stat_polling_watcher_waits_for_missing_paths(self):
+        self._assert_detects_created_paths(
+            lambda paths: StatPollingWatcher(paths, interval=0.05)
+        )
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_inotify_watcher_watches_added_paths(self):
+        self._assert_detects_added_paths(InotifyWatcher)
+
+    def test_stat_polling_watcher_watches_added_paths(self):
+        self._assert_detects_added_paths(
+            lambda paths: StatPollingWatcher(paths, interval=0.05)
+        )
+
+    def test_path_watcher_is_abstract(self):
+        with self.assertRaises(TypeError):
+            PathWatcher([])
+
+    def test_stat_polling_watcher(self):
+        self._assert_detects_changes(
+            lambda paths: StatPollingWatcher(paths, interval=0.05)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
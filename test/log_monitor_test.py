@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.log_monitor import EmulationLogMonitor, EmulationSession, LogTailer
+
+SESSION = [
+    "·! 0:00:00.000010 SYS: RPCS3 v0.0.20",
+    "·! 0:00:02.000000 SYS: Title: WipEout HD Fury",
+    "·! 0:00:02.000100 SYS: Serial: BCES00664",
+    "·S 0:00:05.500000 SYS: Boot successful.",
+    "·W 0:00:30.000000 RSX: Unimplemented method",
+    "·! 0:10:05.500000 SYS: Stopping emulator...",
+    "·! 0:10:06.000000 SYS: Emulation stopped",
+]
+
+
+class TestLogTailer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.directory, "RPCS3.log")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, text: str, mode: str = "a"):
+        with open(self.log_file, mode, encoding="utf-8") as file:
+            file.write(text)
+
+    def test_reads_appended_lines_once(self):
+        tailer = LogTailer(self.log_file)
+        self.assertEqual(tailer.read_lines(), [])
+
+        self.write("first\nsec")
+        self.assertEqual(tailer.read_lines(), ["first"])
+        self.assertEqual(tailer.read_lines(), [])
+
+        self.write("ond\r\nthird\n")
+        self.assertEqual(tailer.read_lines(), ["second", "third"])
+
+    def test_restarts_after_truncation_and_rotation(self):
+        self.write("old line\n" * 10)
+        tailer = LogTailer(self.log_file)
+        tailer.read_lines()
+
+        # Truncated and grown back beyond the previous offset
+        self.write("new line\n" * 20, mode="w")
+        self.assertEqual(tailer.read_lines(), ["new line"] * 20)
+        self.assertEqual(tailer.restarts, 1)
+
+        os.rename(self.log_file, self.log_file + ".old")
+        self.write("rotated\n")
+        self.assertEqual(tailer.read_lines(), ["rotated"])
+        self.assertEqual(tailer.restarts, 2)
+
+
+class TestEmulationLogMonitor(unittest.TestCase):
+    def setUp(self):
+        self.changes = []
+        self.sessions = []
+        self.monitor = EmulationLogMonitor(
+            os.devnull, self.changes.append, self.sessions.append
+        )
+
+    def test_detects_boot_and_stop(self):
+        self.monitor.feed(SESSION[:4])
+        self.assertEqual(self.monitor.running_title_id, "BCES00664")
+
+        self.monitor.feed(SESSION[4:])
+        self.assertIsNone(self.monitor.running_title_id)
+        self.assertEqual(self.changes, ["BCES00664", "BCES00664"])
+        self.assertEqual(self.sessions, [EmulationSession("BCES00664", 600.0)])
+
+    def test_booting_another_title_ends_the_session(self):
+        self.monitor.feed(SESSION[:4])
+        self.monitor.feed(
+            [
+                "·! 0:01:00.000000 SYS: Serial: NPEB00001",
+                "·S 0:01:05.500000 SYS: Boot successful.",
+            ]
+        )
+
+        self.assertEqual(self.monitor.running_title_id, "NPEB00001")
+        self.assertEqual(self.sessions, [EmulationSession("BCES00664", 60.0)])
+
+    def test_backfill_is_not_reported(self):
+        self.monitor.backfill(SESSION + SESSION[:4])
+
+        self.assertEqual(self.monitor.running_title_id, "BCES00664")
+        self.assertEqual(self.changes, [])
+        self.assertEqual(self.sessions, [])
+
+        # A stop logged after the backfill ends the session booted before it
+        self.monitor.feed(SESSION[4:])
+        self.assertEqual(self.changes, ["BCES00664"])
+        self.assertEqual(self.sessions, [EmulationSession("BCES00664", 600.0)])
+
+    def test_abandoned_titles_are_not_reported(self):
+        self.monitor.backfill(SESSION[:4])
+        self.monitor.abandon()
+
+        self.assertIsNone(self.monitor.running_title_id)
+        self.monitor.feed(SESSION[4:])
+        self.assertEqual(self.changes, [])
+        self.assertEqual(self.sessions, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.metadata_index import SfoMetadataIndex
+from test.helpers import touch_newer
+
+
+class TestSfoMetadataIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.sfo_file = os.path.join(self.directory, "PARAM.SFO")
+        shutil.copyfile("test/wipeout.sfo", self.sfo_file)
+
+        self.index = SfoMetadataIndex(os.path.join(self.directory, "index.sqlite3"))
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.directory)
+
+    def test_lookup_and_queries(self):
+        metadata = self.index.lookup(self.sfo_file)
+
+        self.assertEqual(metadata.title, "WipEout® HD Fury")
+        self.assertEqual(metadata.title_id, "BCES00664")
+        self.assertEqual(self.index.by_title_id("BCES00664"), [metadata])
+        self.assertEqual(self.index.by_category("DG"), [metadata])
+        self.assertEqual(metadata.to_sfo().app_version, "02.00")
+
+    def test_retain(self):
+        other_sfo_file = os.path.join(self.directory, "OTHER.SFO")
+        shutil.copyfile("test/wipeout.sfo", other_sfo_file)
+        self.index.lookup(self.sfo_file)
+        self.index.lookup(other_sfo_file)
+
+        self.assertEqual(self.index.retain([self.sfo_file]), [other_sfo_file])
+        self.assertEqual(
+            [metadata.path for metadata in self.index.by_title_id("BCES00664")],
+            [self.sfo_file],
+        )
+
+    def test_revalidate(self):
+        self.index.lookup(self.sfo_file)
+        self.assertEqual(self.index.revalidate(), [])
+
+        os.remove(self.sfo_file)
+        self.assertEqual(self.index.revalidate(), [self.sfo_file])
+        self.assertEqual(self.index.by_title_id("BCES00664"), [])
+
+    def test_revalidate_drops_corrupt_files(self):
+        other_sfo_file = os.path.join(self.directory, "OTHER.SFO")
+        shutil.copyfile("test/wipeout.sfo", other_sfo_file)
+        self.index.lookup(self.sfo_file)
+        self.index.lookup(other_sfo_file)
+
+        with open(self.sfo_file, "wb") as file:
+            file.write(b"\0PSF" + b"\xff" * 40)
+        touch_newer(self.sfo_file)
+
+        self.assertEqual(self.index.revalidate(), [self.sfo_file])
+        self.assertEqual(
+            [metadata.path for metadata in self.index.by_title_id("BCES00664")],
+            [other_sfo_file],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
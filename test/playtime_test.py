@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from src import playtime
+from src.playtime import GamePlaytime, PlaytimeReader, parse_persistent_settings
+from test.helpers import touch_newer
+
+SETTINGS = """[General]
+Playtime=ignored
+
+[LastPlayed]
+BLES00001=May 5 2021 21:30
+BLUS30002="January 12 2020"
+NPEB00003=not a date
+
+[Playtime]
+BLES00001=3630000
+NPEB00003=59999
+BCES00004=abc
+"""
+
+
+class TestParsePersistentSettings(unittest.TestCase):
+    def test_reads_playtime_and_last_played(self):
+        self.assertEqual(
+            parse_persistent_settings(SETTINGS.splitlines()),
+            {
+                "BLES00001": GamePlaytime(
+                    60, int(datetime(2021, 5, 5, 21, 30).timestamp())
+                ),
+                "BLUS30002": GamePlaytime(None, int(datetime(2020, 1, 12).timestamp())),
+                "NPEB00003": GamePlaytime(0, None),
+            },
+        )
+
+
+class TestPlaytimeReader(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings_file = os.path.join(
+            self.directory.name, "persistent_settings.dat"
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_missing_file_has_no_playtime(self):
+        self.assertEqual(PlaytimeReader(self.settings_file).read(), {})
+
+    def test_parses_again_only_when_the_file_changes(self):
+        with open(self.settings_file, "w") as settings:
+            settings.write(SETTINGS)
+
+        reader = PlaytimeReader(self.settings_file)
+
+        with mock.patch.object(
+            playtime,
+            "parse_persistent_settings",
+            wraps=parse_persistent_settings,
+        ) as parse:
+            first = reader.read()
+            self.assertIs(reader.read(), first)
+            self.assertEqual(parse.call_count, 1)
+
+            with open(self.settings_file, "a") as settings:
+                settings.write("BLES00005=120000\n")
+            touch_newer(self.settings_file)
+
+            self.assertEqual(reader.read()["BLES00005"], GamePlaytime(2, None))
+            self.assertEqual(parse.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,250 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from galaxy.api.consts import LocalGameState
+from galaxy.unittest.mock import async_return_value
+
+from src.library_snapshot import GameRecord, LibrarySnapshot
+from src.rpcs3 import GameNotFoundError, LibraryScan, StorageUnreachableError
+
+# The setup server only supports Windows, which the plugin is built for
+with mock.patch("platform.system", return_value="Windows"):
+    import plugin
+
+INSTALLED = LocalGameState.Installed
+
+
+class FakeGame:
+    def __init__(self, game_id: str, title: str):
+        self.id = game_id
+        self.title = title
+
+    def find_eboot_file(self) -> str:
+        return f"C:/games/{self.id}/PS3_GAME/USRDIR/EBOOT.BIN"
+
+
+def create_scan(games, failures=None, stamps=((1, 1),)) -> LibraryScan:
+    return LibraryScan(
+        games,
+        failures or {},
+        stamps,
+        {game.id: True for game in games},
+        [],
+    )
+
+
+class TestPlugin(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+        with mock.patch.object(
+            plugin,
+            "METADATA_INDEX_FILE",
+            os.path.join(self.directory, "metadata_index.sqlite3"),
+        ), mock.patch.object(
+            plugin,
+            "TROPHY_CATALOG_FILE",
+            os.path.join(self.directory, "trophy_catalog.sqlite3"),
+        ):
+            self.plugin = plugin.RPCS3IntegrationPlugin(
+                mock.MagicMock(), mock.MagicMock(), "token"
+            )
+        self.plugin._connection = mock.MagicMock()
+
+        self.tasks = []
+        self.plugin.create_task = self.create_task
+
+        self.scan = create_scan([FakeGame("BCES00664", "WipEout® HD Fury")])
+        self.plugin.rpcs3 = mock.MagicMock()
+        self.plugin.rpcs3.library_sfo_files = []
+        self.plugin.rpcs3.scan_games.side_effect = lambda max_age=None: (
+            async_return_value(self.scan)
+        )
+
+    def create_task(self, coro, description):
+        task = asyncio.ensure_future(coro)
+        self.tasks.append(task)
+        return task
+
+    def notifications(self):
+        return [
+            (call.args[0], call.args[1])
+            for call in self.plugin._connection.send_notification.call_args_list
+            if call.args[0] != "push_cache"
+        ]
+
+    def tearDown(self):
+        self.plugin.metadata_index.close()
+        self.plugin.trophy_catalog.close()
+        shutil.rmtree(self.directory)
+
+    def test_prefetched_scan_answers_the_first_imports(self):
+        async def run():
+            self.plugin.handshake_complete()
+            await self.plugin.get_owned_games()
+            await self.plugin.get_local_games()
+            await self.plugin.get_owned_games()
+            await self.plugin.get_local_games()
+
+        asyncio.run(run())
+
+        max_age = plugin.PREFETCHED_SCAN_MAX_AGE
+        self.assertEqual(
+            self.plugin.rpcs3.scan_games.call_args_list,
+            [mock.call(), mock.call(max_age), mock.call(max_age)]
+            + [mock.call(None)] * 2,
+        )
+
+    def _start_warm(self, library_stamps):
+        self.plugin.persistent_cache[plugin.LIBRARY_SNAPSHOT_CACHE_KEY] = (
+            LibrarySnapshot(
+                {"BCES00664": GameRecord("Old Title", INSTALLED)}, ((1, 1),)
+            ).serialize()
+        )
+        self.plugin.rpcs3.read_library_stamps.return_value = library_stamps
+
+        async def run():
+            self.plugin.handshake_complete()
+            games = await self.plugin.get_owned_games()
+            await asyncio.gather(*self.tasks)
+            return games
+
+        return asyncio.run(run())
+
+    def test_warm_start_answers_from_the_cached_snapshot(self):
+        games = self._start_warm(((1, 1),))
+
+        self.assertEqual([game.game_title for game in games], ["Old Title"])
+        # Only the prefetch scanned, since the library is unchanged
+        self.assertEqual(self.plugin.rpcs3.scan_games.call_args_list, [mock.call()])
+        self.assertEqual(self.notifications(), [])
+
+    def test_warm_start_revalidates_a_changed_library(self):
+        self.scan = create_scan(
+            [
+                FakeGame("BCES00664", "WipEout® HD Fury"),
+                FakeGame("NPEB00001", "PSN Game"),
+            ],
+            stamps=((2, 2),),
+        )
+        games = self._start_warm(((2, 2),))
+
+        self.assertEqual([game.game_title for game in games], ["Old Title"])
+        self.assertEqual(
+            [method for method, _params in self.notifications()],
+            ["owned_game_added", "local_game_status_changed", "owned_game_updated"],
+        )
+        self.assertEqual(
+            LibrarySnapshot.deserialize(
+                self.plugin.persistent_cache[plugin.LIBRARY_SNAPSHOT_CACHE_KEY]
+            ).stamps,
+            ((2, 2),),
+        )
+
+    def test_snapshot_keeps_games_on_unreachable_storage(self):
+        self.plugin._reported_snapshot = LibrarySnapshot(
+            {
+                "BCES00664": GameRecord("WipEout® HD Fury", INSTALLED),
+                "BLUS00000": GameRecord("Network Game", INSTALLED),
+                "BLUS00001": GameRecord("Broken Game", INSTALLED),
+            },
+            ((1, 1),),
+        )
+
+        snapshot = self.plugin._snapshot_of(
+            create_scan(
+                [FakeGame("BCES00664", "WipEout® HD Fury")],
+                {
+                    "BLUS00000": StorageUnreachableError(),
+                    "BLUS00001": ValueError("Invalid SFO"),
+                },
+            )
+        )
+
+        self.assertEqual(
+            snapshot.games,
+            {
+                "BCES00664": GameRecord("WipEout® HD Fury", INSTALLED),
+                "BLUS00000": GameRecord("Network Game", LocalGameState.None_),
+            },
+        )
+        self.assertIsNone(snapshot.stamps)
+
+    def test_completed_size_import_cancels_pending_sizes(self):
+        async def get_game_size(game_id):
+            if game_id == "NPEB00001":
+                raise GameNotFoundError(game_id)
+            if game_id == "BLUS00000":
+                await asyncio.Event().wait()
+            return 1024
+
+        self.plugin.rpcs3.get_game_size.side_effect = get_game_size
+
+        async def run():
+            context = await self.plugin.prepare_local_size_context(
+                ["BCES00664", "NPEB00001", "BLUS00000"]
+            )
+            sizes = [
+                await self.plugin.get_local_size(game_id, context)
+                for game_id in ("BCES00664", "NPEB00001")
+            ]
+
+            self.plugin.local_size_import_complete()
+            await asyncio.sleep(0)
+            return sizes, context
+
+        sizes, context = asyncio.run(run())
+
+        self.assertEqual(sizes, [1024, None])
+        self.assertTrue(context["BLUS00000"].cancelled())
+        self.assertEqual(self.plugin._size_tasks, {})
+
+    def test_configuration_holds_every_installation(self):
+        configuration = self.plugin._parse_configuration_from_next_step(
+            {
+                "end_uri": "http://localhost/callback"
+                "?executable=C%3A%2Frpcs3%2Frpcs3.exe"
+                "&configurationDirectory=C%3A%2Frpcs3"
+                "&executable=D%3A%2Fnightly%2Frpcs3.exe"
+                "&configurationDirectory=D%3A%2Fnightly"
+            }
+        )
+
+        self.assertEqual(
+            configuration,
+            {
+                "installations": [
+                    {
+                        "executable": "C:/rpcs3/rpcs3.exe",
+                        "configurationDirectory": "C:/rpcs3",
+                    },
+                    {
+                        "executable": "D:/nightly/rpcs3.exe",
+                        "configurationDirectory": "D:/nightly",
+                    },
+                ]
+            },
+        )
+        self.assertEqual(
+            plugin.RPCS3IntegrationPlugin._installation_configurations(configuration),
+            configuration["installations"],
+        )
+
+    def test_legacy_credentials_hold_a_single_installation(self):
+        credentials = {
+            "executable": "C:/rpcs3/rpcs3.exe",
+            "configurationDirectory": "C:/rpcs3",
+        }
+
+        self.assertEqual(
+            plugin.RPCS3IntegrationPlugin._installation_configurations(credentials),
+            [credentials],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
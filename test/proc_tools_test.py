@@ -0,0 +1,102 @@
+import importlib.util
+import os
+import sys
+import unittest
+from unittest import mock
+
+from galaxy import proc_tools
+from galaxy.proc_tools import ProcessId, ProcessInfo, ProcessScanner
+
+
+class FakeProcesses:
+    """Stands in for the per-process readers of `galaxy.proc_tools`."""
+
+    def __init__(self):
+        # Maps PIDs to (stamp, binary path)
+        self.processes = {}
+        self.examined = []
+
+    def read_binary_path(self, pid):
+        self.examined.append(pid)
+        return self.processes[pid][1]
+
+    def patch(self):
+        return mock.patch.multiple(
+            proc_tools,
+            _scan_pids=lambda: list(self.processes),
+            _read_process_stamp=lambda pid: self.processes[pid][0],
+            _read_binary_path=self.read_binary_path,
+            _read_command_line=lambda pid: [self.processes[pid][1]],
+        )
+
+
+class TestProcessScanner(unittest.TestCase):
+    def setUp(self):
+        self.fake = FakeProcesses()
+        self.scanner = ProcessScanner(lambda binary_path: "rpcs3" in binary_path)
+
+    def scan(self):
+        with self.fake.patch():
+            return self.scanner.scan()
+
+    def test_examines_new_pids_once(self):
+        self.fake.processes = {
+            ProcessId(1): ((10, "init"), "/sbin/init"),
+            ProcessId(2): ((20, "rpcs3"), "/usr/bin/rpcs3"),
+        }
+
+        self.assertEqual(
+            self.scan(),
+            [ProcessInfo(ProcessId(2), "/usr/bin/rpcs3", ["/usr/bin/rpcs3"])],
+        )
+        self.scan()
+        self.assertEqual(sorted(self.fake.examined), [1, 2])
+
+        del self.fake.processes[ProcessId(2)]
+        self.assertEqual(self.scan(), [])
+
+    def test_reexamines_reused_pids_and_exec(self):
+        self.fake.processes = {ProcessId(3): ((30, "sh"), "/bin/sh")}
+        self.assertEqual(self.scan(), [])
+
+        # The shell executes RPCS3, which changes the name but not the start time
+        self.fake.processes = {ProcessId(3): ((30, "rpcs3"), "/usr/bin/rpcs3")}
+        self.assertEqual(len(self.scan()), 1)
+
+        # Another process gets the PID
+        self.fake.processes = {ProcessId(3): ((40, "rpcs3"), "/bin/true")}
+        self.assertEqual(self.scan(), [])
+        self.assertEqual(self.fake.examined, [3, 3, 3])
+
+    def _assert_finds_own_process(self, tools):
+        executable = os.path.normcase(os.path.realpath(sys.executable))
+        scanner = tools.ProcessScanner(
+            lambda binary_path: os.path.normcase(binary_path) == executable
+        )
+        processes = {process.pid: process for process in scanner.scan()}
+
+        self.assertIn(os.getpid(), processes)
+        self.assertTrue(processes[os.getpid()].command_line)
+
+        stamp = tools._read_process_stamp(os.getpid())
+        self.assertNotEqual(stamp, (0, ""))
+        self.assertEqual(tools._read_process_stamp(os.getpid()), stamp)
+
+    def test_finds_own_process(self):
+        self._assert_finds_own_process(proc_tools)
+
+    @unittest.skipIf(sys.platform == "win32", "psutil isn't bundled on Windows")
+    def test_psutil_fallback_finds_own_process(self):
+        # Load a copy of the module as on platforms other than Linux and Windows
+        spec = importlib.util.spec_from_file_location(
+            "proc_tools_fallback", proc_tools.__file__
+        )
+        tools = importlib.util.module_from_spec(spec)
+        with mock.patch("sys.platform", "darwin"):
+            spec.loader.exec_module(tools)
+
+        self._assert_finds_own_process(tools)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import asyncio
+import sys
+import unittest
+
+from galaxy.proc_tools import ProcessId, ProcessInfo
+from src.process_tracker import (
+    ProcessTracker,
+    eboot_game_ids,
+    games_in_processes,
+    is_rpcs3_binary,
+)
+
+
+class TestProcessTracker(unittest.TestCase):
+    def test_reports_start_and_exit(self):
+        changes = []
+
+        async def run():
+            tracker = ProcessTracker(
+                lambda game_id: changes.append((game_id, tracker.is_running(game_id)))
+            )
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, "-c", "import time; time.sleep(0.1)"
+            )
+            await tracker.watch("BCES00664", process)
+
+            return tracker
+
+        tracker = asyncio.run(run())
+
+        self.assertEqual(changes, [("BCES00664", True), ("BCES00664", False)])
+        self.assertEqual(tracker.running_game_ids, [])
+
+    def test_sources_are_deduplicated(self):
+        changes = []
+        tracker = ProcessTracker(changes.append)
+
+        tracker.set_external("processes", ["BCES00664"])
+        tracker.set_external("log", ["BCES00664", "NPEB00001"])
+        tracker.set_external("processes", [])
+        self.assertEqual(changes, ["BCES00664", "NPEB00001"])
+        self.assertTrue(tracker.is_running("BCES00664"))
+
+        tracker.set_external("log", [])
+        self.assertEqual(sorted(changes[2:]), ["BCES00664", "NPEB00001"])
+        self.assertEqual(tracker.running_game_ids, [])
+
+
+class TestGamesInProcesses(unittest.TestCase):
+    def test_maps_eboot_arguments_to_games(self):
+        eboot_files = eboot_game_ids({"BCES00664": "/games/wipeout/EBOOT.BIN"})
+        processes = [
+            ProcessInfo(ProcessId(1), "/usr/bin/rpcs3", ["rpcs3"]),
+            ProcessInfo(
+                ProcessId(2),
+                "/usr/bin/rpcs3",
+                ["rpcs3", "--no-gui", "/games//wipeout/EBOOT.BIN"],
+            ),
+        ]
+
+        self.assertEqual(games_in_processes(processes, eboot_files), {"BCES00664"})
+        self.assertTrue(is_rpcs3_binary("/opt/RPCS3/rpcs3.exe"))
+        self.assertFalse(is_rpcs3_binary("/usr/bin/python3"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,293 @@
+import asyncio
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from src.metadata_index import SfoMetadataIndex
+from src.rpcs3 import RPCS3, StorageUnreachableError
+from src.trophies import UnlockedTrophy
+from test.helpers import (
+    build_sfo,
+    build_tropusr,
+    create_game,
+    create_hdd0_content,
+    write_tropconf,
+)
+
+
+def create_stub_executable(directory: str, seconds: float) -> str:
+    """Creates an executable that stands in for RPCS3 and exits after `seconds`."""
+    executable = os.path.join(directory, "rpcs3-stub")
+
+    with open(executable, "w") as file:
+        file.write(f"#!{sys.executable}\nimport time\ntime.sleep({seconds})\n")
+
+    os.chmod(executable, os.stat(executable).st_mode | stat.S_IXUSR)
+    return executable
+
+
+class TestRPCS3(unittest.TestCase):
+    def setUp(self):
+        self.config_directory = tempfile.mkdtemp()
+        self.games_directory = os.path.join(self.config_directory, "games")
+
+        with open(os.path.join(self.config_directory, "games.yml"), "w") as file:
+            for game_id, sfo_file in [
+                ("BCES00664", "test/wipeout.sfo"),
+                ("BLUS00000", None),
+            ]:
+                directory = create_game(self.games_directory, game_id, sfo_file)
+                file.write(f"{game_id}: {directory}/\n")
+
+        self.rpcs3 = RPCS3("rpcs3", self.config_directory)
+
+    def tearDown(self):
+        self.rpcs3.close()
+        shutil.rmtree(self.config_directory)
+
+    def test_scan_isolates_failures(self):
+        scan = asyncio.run(self.rpcs3.scan_games())
+
+        self.assertEqual([game.id for game in scan.games], ["BCES00664"])
+        self.assertEqual(scan.games[0].title, "WipEout® HD Fury")
+        self.assertIsInstance(scan.failures["BLUS00000"], FileNotFoundError)
+
+    def test_concurrent_scans_are_coalesced(self):
+        async def scan_concurrently():
+            first, second = await asyncio.gather(
+                self.rpcs3.scan_games(), self.rpcs3.scan_games()
+            )
+            third = await self.rpcs3.scan_games()
+
+            with mock.patch.object(RPCS3, "SCAN_REUSE_SECONDS", 0):
+                await asyncio.sleep(0.01)
+                fourth = await self.rpcs3.scan_games()
+
+            return first, second, third, fourth
+
+        first, second, third, fourth = asyncio.run(scan_concurrently())
+
+        self.assertIs(first, second)
+        self.assertIs(first, third)
+        self.assertIsNot(first, fourth)
+
+    def test_games_file_is_reread_only_when_changed(self):
+        games = self.rpcs3.read_games()
+        self.assertIs(self.rpcs3.read_games()[0], games[0])
+
+        with open(self.rpcs3.games_file, "a") as file:
+            file.write("BLUS11111: /somewhere/\n")
+
+        self.assertEqual(len(self.rpcs3.read_games()), 3)
+        self.assertEqual(
+            self.rpcs3.get_game_by_id("BLUS11111").directory, "/somewhere/"
+        )
+
+    def test_lookups_do_not_list_hdd0_entries(self):
+        create_hdd0_content(
+            self.config_directory,
+            "NPEB00001",
+            TITLE="PSN Game",
+            TITLE_ID="NPEB00001",
+            CATEGORY="HG",
+        )
+        self.rpcs3.read_games()
+
+        with mock.patch("src.rpcs3.os.scandir") as scandir:
+            self.assertEqual(self.rpcs3.get_game_by_id("NPEB00001").title, "PSN Game")
+            scandir.assert_not_called()
+
+    def test_hdd0_games_are_merged(self):
+        create_hdd0_content(
+            self.config_directory,
+            "NPEB00001",
+            TITLE="PSN Game",
+            TITLE_ID="NPEB00001",
+            CATEGORY="HG",
+        )
+        create_hdd0_content(
+            self.config_directory,
+            "BCES00664",
+            TITLE="WipEout",
+            TITLE_ID="BCES00664",
+            CATEGORY="GD",
+            APP_VER="02.01",
+        )
+        create_hdd0_content(
+            self.config_directory,
+            "BCES00664DLC",
+            TITLE="Fury",
+            TITLE_ID="BCES00664",
+            CATEGORY="AC",
+        )
+        os.makedirs(os.path.join(self.rpcs3.hdd0_game_directory, "BROKEN"))
+
+        games = {game.id: game for game in self.rpcs3.read_games()}
+
+        self.assertEqual(sorted(games), ["BCES00664", "BLUS00000", "NPEB00001"])
+        self.assertEqual(games["NPEB00001"].title, "PSN Game")
+        self.assertEqual(
+            games["NPEB00001"].find_eboot_file(),
+            os.path.join(
+                self.rpcs3.hdd0_game_directory, "NPEB00001", "USRDIR", "EBOOT.BIN"
+            ),
+        )
+        self.assertEqual(
+            [update.app_version for update in games["BCES00664"].updates], ["02.01"]
+        )
+        self.assertEqual(
+            [dlc.title for dlc in games["BCES00664"].additional_content], ["Fury"]
+        )
+        self.assertCountEqual(
+            self.rpcs3.library_sfo_files,
+            [
+                game.sfo_file
+                for game in (
+                    *games.values(),
+                    *games["BCES00664"].updates,
+                    *games["BCES00664"].additional_content,
+                )
+            ],
+        )
+
+    def test_hdd0_sfos_are_stat_once_per_scan(self):
+        directory = create_hdd0_content(
+            self.config_directory,
+            "NPEB00001",
+            TITLE="PSN Game",
+            TITLE_ID="NPEB00001",
+            CATEGORY="HG",
+        )
+        sfo_file = os.path.join(directory, "PARAM.SFO")
+
+        with mock.patch("src.rpcs3.os.stat", wraps=os.stat) as stat:
+            scan = asyncio.run(self.rpcs3.scan_games())
+
+        self.assertIn("NPEB00001", [game.id for game in scan.games])
+        self.assertEqual(
+            [call.args[0] for call in stat.call_args_list].count(sfo_file), 1
+        )
+
+    def test_hdd0_sfo_written_after_its_directory_is_picked_up(self):
+        directory = os.path.join(self.rpcs3.hdd0_game_directory, "NPEB00001")
+        os.makedirs(directory)
+        scan = asyncio.run(self.rpcs3.scan_games(0))
+        self.assertNotIn("NPEB00001", [game.id for game in scan.games])
+        self.assertIn(os.path.join(directory, "PARAM.SFO"), scan.pending_files)
+
+        with open(os.path.join(directory, "PARAM.SFO"), "wb") as file:
+            file.write(
+                build_sfo(dict(TITLE="PSN Game", TITLE_ID="NPEB00001", CATEGORY="HG"))
+            )
+
+        scan = asyncio.run(self.rpcs3.scan_games(0))
+        self.assertIn("NPEB00001", [game.id for game in scan.games])
+        self.assertNotIn(os.path.join(directory, "PARAM.SFO"), scan.pending_files)
+
+    def test_unreachable_games_keep_indexed_metadata(self):
+        index = SfoMetadataIndex(os.path.join(self.config_directory, "index.sqlite3"))
+        indexing = RPCS3("rpcs3", self.config_directory, index)
+        asyncio.run(indexing.scan_games())
+        indexing.close()
+
+        async def check_unreachable(paths):
+            return {file_path: None for file_path in paths}
+
+        rpcs3 = RPCS3("rpcs3", self.config_directory, index)
+        rpcs3.install_state_checker.check = check_unreachable
+        scan = asyncio.run(rpcs3.scan_games())
+        rpcs3.close()
+        index.close()
+
+        self.assertEqual([game.title for game in scan.games], ["WipEout® HD Fury"])
+        self.assertEqual(scan.installed, {"BCES00664": False})
+        self.assertIsInstance(scan.failures["BLUS00000"], StorageUnreachableError)
+
+    def test_missing_games_keep_indexed_metadata(self):
+        index = SfoMetadataIndex(os.path.join(self.config_directory, "index.sqlite3"))
+        indexing = RPCS3("rpcs3", self.config_directory, index)
+        asyncio.run(indexing.scan_games())
+        indexing.close()
+
+        # As if the drive holding the game was unplugged during a restart
+        shutil.move(
+            os.path.join(self.games_directory, "BCES00664"),
+            os.path.join(self.config_directory, "unplugged"),
+        )
+
+        rpcs3 = RPCS3("rpcs3", self.config_directory, index)
+        scan = asyncio.run(rpcs3.scan_games())
+        rpcs3.close()
+        index.close()
+
+        self.assertEqual([game.title for game in scan.games], ["WipEout® HD Fury"])
+        self.assertEqual(scan.installed, {"BCES00664": False})
+        self.assertNotIn("BCES00664", scan.failures)
+
+    def test_unlocked_trophies_are_merged_across_users(self):
+        os.makedirs(
+            os.path.join(
+                self.games_directory, "BCES00664", "PS3_GAME", "TROPDIR", "NPWR00001_00"
+            )
+        )
+
+        for user, states in [
+            ("00000001", {0: 1600000000, 1: None}),
+            ("00000002", {0: 1500000000, 1: 1700000000}),
+        ]:
+            trophy_directory = os.path.join(
+                self.rpcs3.hdd0_home_directory, user, "trophy", "NPWR00001_00"
+            )
+            os.makedirs(trophy_directory)
+            with open(os.path.join(trophy_directory, "TROPUSR.DAT"), "wb") as file:
+                file.write(build_tropusr(states))
+        write_tropconf(os.path.join(trophy_directory, "TROPCONF.SFM"))
+
+        unlocked = asyncio.run(
+            self.rpcs3.read_unlocked_trophies(["BCES00664", "BLUS00000", "MISSING"])
+        )
+
+        self.assertEqual(
+            unlocked,
+            {
+                "BCES00664": [
+                    UnlockedTrophy(0, 1500000000, "Platinum"),
+                    UnlockedTrophy(1, 1700000000, "Zone & Beyond"),
+                ],
+                "BLUS00000": [],
+                "MISSING": [],
+            },
+        )
+        self.assertEqual(len(self.rpcs3.trophies), 2)
+
+    @unittest.skipIf(sys.platform == "win32", "stub executable needs a shebang")
+    def test_launch_keeps_loop_responsive(self):
+        self.rpcs3.executable = create_stub_executable(self.config_directory, 0.5)
+
+        async def launch_and_tick():
+            started = time.monotonic()
+            process = await self.rpcs3.launch_game_by_id("BCES00664")
+            spawned = time.monotonic() - started
+
+            ticks = 0
+            while process.returncode is None:
+                await asyncio.sleep(0.01)
+                ticks += 1
+            await process.wait()
+
+            return spawned, ticks, process
+
+        spawned, ticks, process = asyncio.run(launch_and_tick())
+
+        self.assertLess(spawned, 0.5)
+        self.assertGreater(ticks, 10)
+        self.assertEqual(process.returncode, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from src.sfo import CompactSfo
+from src.sfo_cache import SfoCache
+
+
+def sfo(title: str) -> CompactSfo:
+    return CompactSfo({"TITLE": title, "CATEGORY": "DG"})
+
+
+class TestSfoCache(unittest.TestCase):
+    def test_hits_and_stale_entries(self):
+        cache = SfoCache()
+        cache.put("a/PARAM.SFO", (1, 100), sfo("A"))
+
+        self.assertEqual(cache.get("a/PARAM.SFO", (1, 100)).title, "A")
+        self.assertIsNone(cache.get("a/PARAM.SFO", (2, 100)))
+        self.assertIsNone(cache.get("b/PARAM.SFO", (1, 100)))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_evicts_least_recently_used(self):
+        cache = SfoCache(max_entries=2)
+        cache.put("a", (1, 1), sfo("A"))
+        cache.put("b", (1, 1), sfo("B"))
+        cache.get("a", (1, 1))
+        cache.put("c", (1, 1), sfo("C"))
+
+        self.assertIsNotNone(cache.get("a", (1, 1)))
+        self.assertIsNone(cache.get("b", (1, 1)))
+        self.assertEqual(len(cache), 2)
+
+    def test_bounded_by_bytes(self):
+        cache = SfoCache()
+        cache.put("a", (1, 1), sfo("A"))
+        cache.max_bytes = cache.approximate_bytes * 2
+        for path in "bcde":
+            cache.put(path, (1, 1), sfo(path.upper()))
+
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.approximate_bytes, cache.max_bytes)
+
+
+if __name__ == "__main__":
+    unittest.main()
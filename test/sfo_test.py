@@ -1,6 +1,6 @@
 import unittest
 
-from src.sfo import decode_sfo_file
+from src.sfo import CompactSfo, decode_sfo_file
 
 
 class TestSfoDecoder(unittest.TestCase):
@@ -11,6 +11,28 @@ class TestSfoDecoder(unittest.TestCase):
         self.assertEqual(sfo.app_version, "02.00")
         self.assertEqual(sfo.category, "DG")  # "Disc Game"
 
+    def test_buffered_matches_streaming(self):
+        buffered = decode_sfo_file("test/wipeout.sfo")
+        streaming = decode_sfo_file("test/wipeout.sfo", streaming=True)
+
+        self.assertEqual(buffered._mapping, streaming._mapping)
+
+    def test_selected_keys(self):
+        sfo = decode_sfo_file("test/wipeout.sfo", keys={"TITLE", "TITLE_ID", "NONE"})
+
+        self.assertEqual(
+            sfo._mapping, {"TITLE": "WipEout® HD Fury", "TITLE_ID": "BCES00664"}
+        )
+
+    def test_compact_sfo(self):
+        sfo = CompactSfo(decode_sfo_file("test/wipeout.sfo")._mapping)
+
+        self.assertEqual(sfo.title, "WipEout® HD Fury")
+        self.assertEqual(sfo.category, "DG")
+        self.assertFalse(hasattr(sfo, "__dict__"))
+        with self.assertRaises(KeyError):
+            sfo["RESOLUTION"]
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+from src.trophies import TropusrDecoder, TrophyCache, UnlockedTrophy
+from test.helpers import build_tropusr, touch_newer
+
+
+class TestTropusrDecoder(unittest.TestCase):
+    def test_decodes_unlocked_trophies(self):
+        data = build_tropusr({0: 1600000000, 1: None, 2: 1500000000})
+
+        self.assertEqual(
+            TropusrDecoder().decode(data),
+            [UnlockedTrophy(0, 1600000000), UnlockedTrophy(2, 1500000000)],
+        )
+
+    def test_rejects_invalid_files(self):
+        with self.assertRaises(ValueError):
+            TropusrDecoder().decode(b"\0" * 48)
+
+        with self.assertRaises(ValueError):
+            TropusrDecoder().decode(build_tropusr({0: 1600000000})[:-1])
+
+
+class TestTrophyCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.trophy_file = os.path.join(self.directory.name, "TROPUSR.DAT")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_reloads_changed_files(self):
+        cache = TrophyCache()
+        self.assertIsNone(cache.load(self.trophy_file))
+
+        with open(self.trophy_file, "wb") as file:
+            file.write(build_tropusr({0: 1600000000, 1: None}))
+
+        unlocked = cache.load(self.trophy_file)
+        self.assertEqual(unlocked, [UnlockedTrophy(0, 1600000000)])
+        self.assertIs(cache.load(self.trophy_file), unlocked)
+
+        with open(self.trophy_file, "wb") as file:
+            file.write(build_tropusr({0: 1600000000, 1: 1700000000}))
+        touch_newer(self.trophy_file)
+
+        self.assertEqual(len(cache.load(self.trophy_file)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
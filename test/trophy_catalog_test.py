@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src import trophy_catalog
+from src.trophy_catalog import TrophyCatalog, read_trophy_names
+from test.helpers import TROPCONF, touch_newer, write_tropconf
+
+
+class TestReadTrophyNames(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.config_file = os.path.join(self.directory.name, "TROPCONF.SFM")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_reads_names_by_trophy_id(self):
+        write_tropconf(self.config_file)
+
+        self.assertEqual(
+            read_trophy_names(self.config_file), {0: "Platinum", 1: "Zone & Beyond"}
+        )
+
+    def test_skips_binary_header(self):
+        write_tropconf(self.config_file, header=b"SFM\0" + b"\0" * 60)
+
+        self.assertEqual(len(read_trophy_names(self.config_file)), 2)
+
+
+class TestTrophyCatalog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.config_file = os.path.join(self.directory.name, "TROPCONF.SFM")
+        self.database_path = os.path.join(self.directory.name, "catalog.sqlite3")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_names_are_parsed_once_across_instances(self):
+        write_tropconf(self.config_file)
+
+        with mock.patch.object(
+            trophy_catalog, "read_trophy_names", wraps=read_trophy_names
+        ) as parse:
+            catalog = TrophyCatalog(self.database_path)
+            self.assertEqual(catalog.lookup(self.config_file)[1], "Zone & Beyond")
+            catalog.close()
+
+            catalog = TrophyCatalog(self.database_path)
+            self.assertEqual(catalog.lookup(self.config_file)[0], "Platinum")
+            self.assertEqual(parse.call_count, 1)
+
+            write_tropconf(self.config_file, TROPCONF.replace("Platinum", "Gold"))
+            touch_newer(self.config_file)
+
+            self.assertEqual(catalog.lookup(self.config_file)[0], "Gold")
+            self.assertEqual(parse.call_count, 2)
+            catalog.close()
+
+
+if __name__ == "__main__":
+    unittest.main()